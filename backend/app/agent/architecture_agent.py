@@ -4,6 +4,10 @@ from app.agent.artifacts import ProjectCharter, SystemArchitecture
 from app.agent.base import BaseAgent
 from app.agent.prompts.architecture import ARCHITECTURE_SYSTEM_PROMPT
 
+# Patterns applied per diagram line or per node label are compiled once rather than looked up on every call.
+_MERMAID_NOTE_LINE_RE = re.compile(r"^\s*note\s+(left|right)\s+of\b", re.IGNORECASE)
+_MERMAID_SHAPE_OPEN_RE = re.compile(r"[\[\(\{]")
+_MERMAID_LABEL_NEEDS_QUOTES_RE = re.compile(r"[\s/:,()\-]")
 
 class ArchitectureAgent(BaseAgent[ProjectCharter, SystemArchitecture]):
     """
@@ -36,7 +40,7 @@ class ArchitectureAgent(BaseAgent[ProjectCharter, SystemArchitecture]):
         # Remove fragile note syntax.
         text = "\n".join(
             line for line in text.split("\n")
-            if not re.match(r"^\s*note\s+(left|right)\s+of\b", line, flags=re.IGNORECASE)
+            if not _MERMAID_NOTE_LINE_RE.match(line)
         ).strip()
 
         # Rewrite dotted labeled edges to plain labeled arrows.
@@ -45,8 +49,8 @@ class ArchitectureAgent(BaseAgent[ProjectCharter, SystemArchitecture]):
         # Expand ampersand shorthand declarations (A[...] & B[...]) into one per line.
         expanded: list[str] = []
         for line in text.split("\n"):
-            if "&" in line and re.search(r"[\[\(\{]", line):
-                indent = re.match(r"^\s*", line).group(0)
+            if "&" in line and _MERMAID_SHAPE_OPEN_RE.search(line):
+                indent = line[: len(line) - len(line.lstrip())]
                 parts = [p.strip() for p in line.split("&") if p.strip()]
                 if len(parts) > 1:
                     expanded.extend(f"{indent}{p}" for p in parts)
@@ -63,7 +67,7 @@ class ArchitectureAgent(BaseAgent[ProjectCharter, SystemArchitecture]):
                 return match.group(0)
             if label.startswith("(") or label.startswith("{") or label.startswith("<"):
                 return match.group(0)
-            if re.search(r"[\s/:,()\-]", label):
+            if _MERMAID_LABEL_NEEDS_QUOTES_RE.search(label):
                 safe = label.replace('"', '\\"')
                 return f'{node_id}["{safe}"]'
             return match.group(0)
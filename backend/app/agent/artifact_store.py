@@ -4,6 +4,8 @@ import uuid
 from pathlib import Path
 from typing import Any
 
+from pydantic_core import to_json
+
 from app.agent.artifacts import CodeFile
 
 logger = logging.getLogger(__name__)
@@ -32,12 +34,13 @@ def store_code_bundle(
     bundle_path = store_root / _bundle_filename(run_id, stage)
     payload = {
         "files": [
-            file.model_dump() if isinstance(file, CodeFile) else dict(file)
+            file if isinstance(file, CodeFile) else dict(file)
             for file in files
         ],
         "dependencies": list(dependencies or []),
     }
-    bundle_path.write_text(json.dumps(payload), encoding="utf-8")
+    # pydantic-core serializes CodeFile models straight to UTF-8 bytes, skipping model_dump() and a str round trip.
+    bundle_path.write_bytes(to_json(payload))
     return bundle_path.name
 
 
@@ -51,7 +54,8 @@ def load_code_bundle(bundle_ref: str) -> dict[str, Any] | None:
         return None
 
     try:
-        return json.loads(bundle_path.read_text(encoding="utf-8"))
+        with bundle_path.open("rb") as handle:
+            return json.load(handle)
     except Exception as exc:
         logger.warning("Failed to load artifact bundle %s: %s", bundle_path, exc)
         return None
@@ -18,6 +18,10 @@ from app.agent.prompts.implementer import (
 )
 from app.core.config import settings
 
+# Architecture text can run to several KB, so each keyword set is matched in a single regex pass.
+_AUTH_PLAN_KEYWORD_RE = re.compile("auth|jwt|token|login|signup|user", re.IGNORECASE)
+_AUTH_DESIGN_KEYWORD_RE = re.compile("auth|jwt|login|token", re.IGNORECASE)
+
 
 class ImplementerAgent(BaseAgent[SystemArchitecture, GeneratedCode]):
     """
@@ -65,9 +69,8 @@ class ImplementerAgent(BaseAgent[SystemArchitecture, GeneratedCode]):
                 *list(input_data.components or []),
                 *list(input_data.endpoint_summary or []),
             ]
-        ).lower()
-        auth_keywords = ("auth", "jwt", "token", "login", "signup", "user")
-        auth_required = any(k in architecture_text for k in auth_keywords)
+        )
+        auth_required = _AUTH_PLAN_KEYWORD_RE.search(architecture_text) is not None
 
         files = [
             PlannedCodeFile(path="app/main.py", purpose="FastAPI app entrypoint and router registration"),
@@ -109,9 +112,8 @@ class ImplementerAgent(BaseAgent[SystemArchitecture, GeneratedCode]):
                 normalized_files.append(fallback_map[required_path])
                 seen.add(required_path)
 
-        architecture_text = (input_data.design_document or "").lower()
         if (
-            any(k in architecture_text for k in ("auth", "jwt", "login", "token"))
+            _AUTH_DESIGN_KEYWORD_RE.search(input_data.design_document or "")
             and "app/auth.py" not in seen
             and "app/auth.py" in fallback_map
         ):
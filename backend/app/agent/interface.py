@@ -5,6 +5,10 @@ from pydantic import BaseModel, Field
 from app.agent.base import BaseAgent
 from app.core.config import settings
 
+# The routing heuristics normalize every incoming message, so their patterns are compiled once.
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+_SPEAKER_LABEL_RE = re.compile(r"^\s*Interius:\s*", re.IGNORECASE)
+
 INTERFACE_SYSTEM_PROMPT = """
 You are Interius, the chat interface and intent router for an API/backend code generation assistant.
 
@@ -215,7 +219,7 @@ class InterfaceAgent(BaseAgent[str, InterfaceDecision]):
         attachment_summaries: list[InterfaceAttachmentSummary] | None = None,
     ) -> InterfaceDecision:
         assistant_reply = (decision.assistant_reply or "").strip()
-        assistant_reply = re.sub(r"^\s*Interius:\s*", "", assistant_reply, flags=re.IGNORECASE)
+        assistant_reply = _SPEAKER_LABEL_RE.sub("", assistant_reply)
 
         if decision.should_trigger_pipeline:
             pipeline_prompt = (decision.pipeline_prompt or "").strip() or original_prompt.strip()
@@ -271,7 +275,7 @@ class InterfaceAgent(BaseAgent[str, InterfaceDecision]):
         if not file_with_text:
             return reply or "Interius is starting generation for your request."
 
-        excerpt = re.sub(r"\s+", " ", (file_with_text.text_excerpt or "")).strip()
+        excerpt = _WHITESPACE_RUN_RE.sub(" ", (file_with_text.text_excerpt or "")).strip()
         excerpt = excerpt[:140].rstrip(" ,;:-")
         if not excerpt:
             return reply or "Interius is starting generation for your request."
@@ -296,7 +300,7 @@ class InterfaceAgent(BaseAgent[str, InterfaceDecision]):
         text: str,
         recent_messages: list[InterfaceContextMessage] | None = None,
     ) -> bool:
-        normalized = re.sub(r"\s+", " ", (text or "").lower()).strip()
+        normalized = _WHITESPACE_RUN_RE.sub(" ", (text or "").lower()).strip()
         if not normalized:
             return False
 
@@ -387,7 +391,7 @@ class InterfaceAgent(BaseAgent[str, InterfaceDecision]):
         if not text:
             return None
 
-        normalized = re.sub(r"\s+", " ", text.lower()).strip()
+        normalized = _WHITESPACE_RUN_RE.sub(" ", text.lower()).strip()
         token_count = len(normalized.split())
 
         gratitude_tokens = {
@@ -453,7 +457,7 @@ class InterfaceAgent(BaseAgent[str, InterfaceDecision]):
     ) -> InterfaceDecision | None:
         if not text:
             return None
-        normalized = re.sub(r"\s+", " ", text.lower()).strip()
+        normalized = _WHITESPACE_RUN_RE.sub(" ", text.lower()).strip()
         retrieval_signals = [
             "send the files again",
             "send the file again",
@@ -514,7 +518,7 @@ class InterfaceAgent(BaseAgent[str, InterfaceDecision]):
         if not text or not attachment_summaries:
             return None
 
-        normalized = re.sub(r"\s+", " ", text.lower()).strip()
+        normalized = _WHITESPACE_RUN_RE.sub(" ", text.lower()).strip()
         mentions_attachment = any(
             token in normalized
             for token in ("attach", "attachment", "document", "pdf", "file", "there", "it")
@@ -550,7 +554,7 @@ class InterfaceAgent(BaseAgent[str, InterfaceDecision]):
     ) -> InterfaceDecision | None:
         if not text:
             return None
-        normalized = re.sub(r"\s+", " ", text.lower()).strip()
+        normalized = _WHITESPACE_RUN_RE.sub(" ", text.lower()).strip()
         resume_signals = [
             "use the same architecture",
             "continue from the architecture",
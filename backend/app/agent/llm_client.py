@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 import re
@@ -12,16 +13,43 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+_FENCED_BLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+_WHOLE_FENCE_RE = re.compile(r"^\s*```[a-zA-Z0-9_-]*\s*([\s\S]*?)\s*```\s*$")
+_JSON_SPAN_DECODER = json.JSONDecoder(strict=False)
+
+
+@functools.cache
+def _structured_system_prompts(system_prompt: str, response_schema: type[BaseModel]) -> tuple[str, str]:
+    # Agents pair constant prompts with a handful of schemas: build each pair once instead of re-running
+    # model_json_schema() per call, and keep the system message byte-identical for provider prefix caching.
+    schema_json = json.dumps(response_schema.model_json_schema())
+    augmented_system_prompt = (
+        f"{system_prompt}\n\n"
+        "CRITICAL: You must respond in ONLY valid JSON format matching the following JSON Schema. "
+        "Do not include markdown code blocks (```json) or any conversational text around the JSON.\n\n"
+        f"EXPECTED SCHEMA:\n{schema_json}"
+    )
+    return (
+        augmented_system_prompt,
+        (
+            f"{augmented_system_prompt}\n\n"
+            "RETRY INSTRUCTIONS: Your previous response was invalid or incomplete. "
+            "Return ONLY a single JSON object/array matching the schema. "
+            "Do not add any prose, headings, markdown fences, or explanations."
+        ),
+    )
+
 
 def _extract_fenced_block(text: str) -> str | None:
-    blocks = re.findall(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL | re.IGNORECASE)
-    return blocks[0].strip() if blocks else None
+    # Only the first fenced block is used, so stop at the first match instead of collecting all of them.
+    block = _FENCED_BLOCK_RE.search(text)
+    return block.group(1).strip() if block else None
 
 
 def _strip_code_fences(text: str) -> str:
     if not text:
         return ""
-    fenced = re.match(r"^\s*```[a-zA-Z0-9_-]*\s*([\s\S]*?)\s*```\s*$", text)
+    fenced = _WHOLE_FENCE_RE.match(text)
     if fenced:
         return fenced.group(1).strip()
     return text.strip()
@@ -32,40 +60,17 @@ def _extract_balanced_json_span(text: str) -> str | None:
     if not text:
         return None
 
-    starts = []
-    first_obj = text.find("{")
-    first_arr = text.find("[")
-    if first_obj != -1:
-        starts.append((first_obj, "{", "}"))
-    if first_arr != -1:
-        starts.append((first_arr, "[", "]"))
+    starts = [idx for idx in (text.find("{"), text.find("[")) if idx != -1]
     if not starts:
         return None
 
-    start_idx, open_ch, close_ch = min(starts, key=lambda x: x[0])
-    depth = 0
-    in_string = False
-    escape = False
-    for i in range(start_idx, len(text)):
-        ch = text[i]
-        if in_string:
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            elif ch == '"':
-                in_string = False
-            continue
-
-        if ch == '"':
-            in_string = True
-        elif ch == open_ch:
-            depth += 1
-        elif ch == close_ch:
-            depth -= 1
-            if depth == 0:
-                return text[start_idx:i + 1]
-    return None
+    start_idx = min(starts)
+    # The span is only useful if it parses, so let the C decoder find its end instead of scanning chars in Python.
+    try:
+        _, end_idx = _JSON_SPAN_DECODER.raw_decode(text, start_idx)
+    except json.JSONDecodeError:
+        return None
+    return text[start_idx:end_idx]
 
 
 def _structured_text_candidates(raw_text: str) -> list[str]:
@@ -141,24 +146,7 @@ class LLMClient:
         Generate a structured response matching the provided Pydantic schema.
         Uses JSON mode and injects the schema requirement into the system prompt.
         """
-        schema_json = json.dumps(response_schema.model_json_schema())
-
-        augmented_system_prompt = (
-            f"{system_prompt}\n\n"
-            "CRITICAL: You must respond in ONLY valid JSON format matching the following JSON Schema. "
-            "Do not include markdown code blocks (```json) or any conversational text around the JSON.\n\n"
-            f"EXPECTED SCHEMA:\n{schema_json}"
-        )
-
-        attempt_prompts = [
-            augmented_system_prompt,
-            (
-                f"{augmented_system_prompt}\n\n"
-                "RETRY INSTRUCTIONS: Your previous response was invalid or incomplete. "
-                "Return ONLY a single JSON object/array matching the schema. "
-                "Do not add any prose, headings, markdown fences, or explanations."
-            ),
-        ]
+        attempt_prompts = _structured_system_prompts(system_prompt, response_schema)
 
         last_error: Exception | None = None
         for attempt_idx, system_prompt_attempt in enumerate(attempt_prompts, start=1):
@@ -6,7 +6,7 @@ from sqlmodel import Session
 
 from app.agent.architecture_agent import ArchitectureAgent
 from app.agent.artifact_store import store_code_bundle
-from app.agent.artifacts import GeneratedCode, ProjectCharter, RepairContext, ReviewReport, SystemArchitecture
+from app.agent.artifacts import FilePatchRequest, GeneratedCode, ProjectCharter, RepairContext, ReviewReport, SystemArchitecture
 from app.agent.implementer_agent import ImplementerAgent
 from app.agent.repair_agent import RepairAgent
 from app.agent.requirements_agent import RequirementsAgent
@@ -292,7 +292,6 @@ async def run_pipeline_generator(
 
                 if not patch_requests and targeted_paths:
                     # Build minimal patch requests from issues/affected files so implementer can patch deterministically.
-                    from app.agent.artifacts import FilePatchRequest  # local import to avoid circular import surprises
                     patch_requests = [
                         FilePatchRequest(
                             path=path,
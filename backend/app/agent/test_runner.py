@@ -7,15 +7,27 @@ import re
 import subprocess
 import sys
 import tempfile
-import urllib.request
-import urllib.error
-import urllib.parse
 import uuid
 import time
 from pathlib import Path
 
-from app.agent.artifacts import CodeFile, FilePatchRequest, GeneratedCode, TestFailure, TestRunReport
+import httpx
 
+from app.agent.artifacts import CodeFile, FilePatchRequest, GeneratedCode, TestFailure, TestRunReport
+from app.core.config import settings
+
+DEPLOYABILITY_FAILURE_MARKERS = (
+    "/openapi.json",
+    "failed to fetch /openapi.json",
+    "failed to parse /openapi.json",
+    "fallback shell app",
+    "generated api routes failed to load",
+    "did not expose router",
+)
+_DEPLOYABILITY_FAILURE_RE = re.compile(
+    "|".join(re.escape(marker) for marker in DEPLOYABILITY_FAILURE_MARKERS),
+    re.IGNORECASE,
+)
 
 
 class TestRunner:
@@ -72,16 +84,7 @@ class TestRunner:
     def _is_deployability_failure(failure: TestFailure) -> bool:
         if failure.check in ("syntax", "import_smoke"):
             return True
-        message = str(failure.message or "").lower()
-        deployability_markers = (
-            "/openapi.json",
-            "failed to fetch /openapi.json",
-            "failed to parse /openapi.json",
-            "fallback shell app",
-            "generated api routes failed to load",
-            "did not expose router",
-        )
-        return any(marker in message for marker in deployability_markers)
+        return _DEPLOYABILITY_FAILURE_RE.search(str(failure.message or "")) is not None
 
     async def _live_sandbox_check(self, project_id: str, code: GeneratedCode) -> tuple[list[TestFailure], list[str]]:
         from app.api.routes.sandbox import (
@@ -105,8 +108,11 @@ class TestRunner:
 
         try:
             files_dict = [{"path": f.path, "content": f.content} for f in (code.files or [])]
-            _write_sandbox_bundle(pid, files_dict, code.dependencies or [], normalize_generated_code=True)
-            _launch_project_sandbox(pid, sandbox_mode="normalized")
+            # Docker CLI calls block for seconds; run them off the event loop so other pipeline work keeps streaming.
+            await asyncio.to_thread(
+                _write_sandbox_bundle, pid, files_dict, code.dependencies or [], normalize_generated_code=True
+            )
+            await asyncio.to_thread(_launch_project_sandbox, pid, sandbox_mode="normalized")
         except Exception as exc:
             failures.append(TestFailure(
                 check="import_smoke", 
@@ -115,9 +121,9 @@ class TestRunner:
             ))
             return failures, warnings
 
-        is_ready = _wait_for_sandbox(pid, timeout_seconds=45)
+        is_ready = await asyncio.to_thread(_wait_for_sandbox, pid, timeout_seconds=45)
         
-        logs = _sandbox_logs(pid)
+        logs = await asyncio.to_thread(_sandbox_logs, pid)
         if not is_ready:
             failures.append(TestFailure(
                 check="import_smoke",
@@ -136,80 +142,102 @@ class TestRunner:
         docs_url = _build_project_docs_url(port)
         openapi_url = docs_url.replace("/docs", "/openapi.json")
 
-        try:
-            req = urllib.request.Request(openapi_url)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                if response.status != 200:
-                    failures.append(TestFailure(check="endpoint_smoke", message=f"/openapi.json returned {response.status}"))
-                    return failures, warnings
-                try:
-                    openapi_data = json.loads(response.read().decode())
-                except json.JSONDecodeError:
-                    failures.append(TestFailure(check="endpoint_smoke", message="Failed to parse /openapi.json payload"))
-                    return failures, warnings
-        except Exception as exc:
-            failures.append(TestFailure(check="endpoint_smoke", message=f"Failed to fetch /openapi.json from live sandbox: {exc}"))
-            return failures, warnings
-
-        if _openapi_looks_like_fallback(openapi_data):
-            message = "Live sandbox started a fallback shell app because generated API routes failed to load."
-            if logs and "does not expose a router" in logs.lower():
-                message += " app.routes did not expose router, api_router, or get_router()."
-            failures.append(
-                TestFailure(
-                    check="endpoint_smoke",
-                    message=message,
-                    file_path="app/routes.py",
-                    line_number=1,
-                    patchable=True,
+        # One pooled async client serves the spec fetch and lets the read-only endpoint smokes overlap.
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            try:
+                response = await client.get(openapi_url, timeout=10.0)
+            except Exception as exc:
+                failures.append(TestFailure(check="endpoint_smoke", message=f"Failed to fetch /openapi.json from live sandbox: {exc}"))
+                return failures, warnings
+            if response.status_code != 200:
+                failures.append(TestFailure(check="endpoint_smoke", message=f"/openapi.json returned {response.status_code}"))
+                return failures, warnings
+            try:
+                openapi_data = response.json()
+            except json.JSONDecodeError:
+                failures.append(TestFailure(check="endpoint_smoke", message="Failed to parse /openapi.json payload"))
+                return failures, warnings
+
+            if _openapi_looks_like_fallback(openapi_data):
+                message = "Live sandbox started a fallback shell app because generated API routes failed to load."
+                if logs and "does not expose a router" in logs.lower():
+                    message += " app.routes did not expose router, api_router, or get_router()."
+                failures.append(
+                    TestFailure(
+                        check="endpoint_smoke",
+                        message=message,
+                        file_path="app/routes.py",
+                        line_number=1,
+                        patchable=True,
+                    )
                 )
-            )
-            return failures, warnings
-            
-        checked = 0
-        for path, path_item in (openapi_data.get("paths") or {}).items():
-            if checked >= 12:
-                break
-            if not isinstance(path_item, dict):
-                continue
-            for method in ("get", "post", "put", "patch", "delete"):
-                operation = path_item.get(method)
-                if not isinstance(operation, dict):
+                return failures, warnings
+
+            smoke_targets: list[tuple[str, str]] = []
+            for path, path_item in (openapi_data.get("paths") or {}).items():
+                if len(smoke_targets) >= 12:
+                    break
+                if not isinstance(path_item, dict):
                     continue
-                
+                for method in ("get", "post", "put", "patch", "delete"):
+                    if not isinstance(path_item.get(method), dict):
+                        continue
+                    smoke_targets.append((method, path))
+                    if len(smoke_targets) >= 12:
+                        break
+
+            async def smoke(method: str, path: str) -> httpx.Response | None:
                 # Use a simplified check for the repair loop: just hit the endpoint and ensure it doesn't 500
                 resolved_url = f"http://127.0.0.1:{port}{path}"
                 resolved_url = resolved_url.replace("{", "").replace("}", "") # Strip parameters for quick smoke test
-                
                 try:
-                    req = urllib.request.Request(resolved_url, method=method.upper())
-                    with urllib.request.urlopen(req, timeout=5) as response:
-                        pass # 2xx - 3xx are okay
-                except urllib.error.HTTPError as he:
-                    if he.code >= 500:
-                        try:
-                            error_body = he.read().decode()
-                        except:
-                            error_body = ""
-                        failures.append(TestFailure(
-                            check="endpoint_smoke",
-                            message=f"{method.upper()} {path} returned 500 Internal Server Error in the sandbox.",
-                            patchable=True
-                        ))
-                        if error_body:
-                            failures[-1].message += f"\n\nResponse:\n{error_body}"
-                except Exception as exc:
-                    pass # Skip connection drops or malformed URLs during basic smoke test
-                
-                checked += 1
-                if checked >= 12:
-                    break
+                    return await client.request(method.upper(), resolved_url)
+                except Exception:
+                    return None # Skip connection drops or malformed URLs during basic smoke test
+
+            # Reads overlap freely; writes go one at a time in spec order, since the generated apps use
+            # SQLite (concurrent writers hit "database is locked") and their order must be reproducible.
+            read_indexes = [index for index, (method, _path) in enumerate(smoke_targets) if method == "get"]
+            responses: list[httpx.Response | None] = [None] * len(smoke_targets)
+            read_responses = await asyncio.gather(*(smoke(*smoke_targets[index]) for index in read_indexes))
+            for index, response in zip(read_indexes, read_responses, strict=True):
+                responses[index] = response
+            for index, (method, path) in enumerate(smoke_targets):
+                if method != "get":
+                    responses[index] = await smoke(method, path)
+
+            for (method, path), response in zip(smoke_targets, responses, strict=True):
+                if response is not None and response.status_code >= 500:
+                    failures.append(TestFailure(
+                        check="endpoint_smoke",
+                        message=f"{method.upper()} {path} returned 500 Internal Server Error in the sandbox.",
+                        patchable=True
+                    ))
+                    if response.text:
+                        failures[-1].message += f"\n\nResponse:\n{response.text}"
 
         # If there are sandbox failures, attach full logs to the first one for context
         if failures and logs:
             failures[0].message += f"\n\n--- Sandbox Logs ---\n{logs}"
 
         return failures, warnings
+
+    @staticmethod
+    async def _docker_available() -> bool:
+        from app.api.routes.sandbox import _docker_available
+
+        # The daemon probe is a blocking socket connect; keep it off the event loop like the other Docker calls.
+        return await asyncio.to_thread(_docker_available)
+
+    async def _in_process_smoke_check(self, code: GeneratedCode) -> tuple[list[TestFailure], list[str]]:
+        # Without Docker, import the generated app and drive it through TestClient instead of skipping runtime checks.
+        with tempfile.TemporaryDirectory(prefix="prosit2-smoke-") as tmpdir:
+            root = Path(tmpdir)
+            self._write_files(root, code.files or [])
+            return await self._runtime_smoke_check(root)
+
+    @staticmethod
+    def _extract_local_trace_failure(traceback_text: str, root: Path) -> tuple[str | None, int | None]:
         # Example traceback line: File "C:\\...\\tmp\\app\\routes.py", line 12, in <module>
         pattern = re.compile(r'File "([^"]+)", line (\d+)', re.MULTILINE)
         root_str = str(root.resolve())
@@ -390,12 +418,19 @@ except Exception as exc:
     print(json.dumps({"ok": False, "error": str(exc), "traceback": traceback.format_exc()}))
     sys.exit(1)
 """
-        env = os.environ.copy()
-        env["PYTHONPATH"] = str(root) + os.pathsep + env.get("PYTHONPATH", "")
-        env.setdefault("DATABASE_URL", f"sqlite:///{(root / 'runtime.db').as_posix()}")
-        env.setdefault("AUTH_DATABASE_URL", f"sqlite:///{(root / 'auth-runtime.db').as_posix()}")
-        env.setdefault("SECRET_KEY", "repair-agent-test-secret")
-        env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+        # Build the env from scratch: generated code must never see the backend's own secrets or database.
+        env = {
+            "PATH": os.environ.get("PATH", os.defpath),
+            "HOME": str(root),
+            "PYTHONPATH": str(root),
+            "PYTHONDONTWRITEBYTECODE": "1",
+            "DATABASE_URL": f"sqlite:///{(root / 'runtime.db').as_posix()}",
+            "AUTH_DATABASE_URL": f"sqlite:///{(root / 'auth-runtime.db').as_posix()}",
+            "SECRET_KEY": "repair-agent-test-secret",
+            "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        }
+        if "SYSTEMROOT" in os.environ:
+            env["SYSTEMROOT"] = os.environ["SYSTEMROOT"]
 
         try:
             completed = await asyncio.to_thread(
@@ -512,7 +547,10 @@ except Exception as exc:
 
         if project_id and any(str(f.path or "") == "app/main.py" for f in (code.files or [])):
             checks_run.extend(["import_smoke", "endpoint_smoke"])
-            runtime_failures, runtime_warnings = await self._live_sandbox_check(project_id, code)
+            if settings.SANDBOX_IN_PROCESS_SMOKE and not await self._docker_available():
+                runtime_failures, runtime_warnings = await self._in_process_smoke_check(code)
+            else:
+                runtime_failures, runtime_warnings = await self._live_sandbox_check(project_id, code)
             failures.extend(runtime_failures)
             warnings.extend(runtime_warnings)
 
@@ -1,4 +1,3 @@
-import io
 import uuid
 from typing import Any
 
@@ -13,22 +12,21 @@ from app.text_chunking import chunk_text
 
 router = APIRouter()
 
-def extract_text_from_file(file: UploadFile, content: bytes) -> str:
+def extract_text_from_file(file: UploadFile) -> str:
     """Extracts text from a given file based on content type."""
+    # Read straight from the spooled upload so large PDFs are not copied into memory first.
+    file.file.seek(0)
     if file.content_type == "application/pdf":
         try:
-            pdf_reader = pypdf.PdfReader(io.BytesIO(content))
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text
+            pdf_reader = pypdf.PdfReader(file.file)
+            # Join once at the end rather than re-copying the accumulated text for every page.
+            page_texts = [page.extract_text() for page in pdf_reader.pages]
+            return "".join(f"{page_text}\n" for page_text in page_texts if page_text)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to parse PDF: {str(e)}")
             
     elif file.content_type == "text/plain" or file.content_type == "text/markdown":
-        return content.decode("utf-8")
+        return file.file.read().decode("utf-8")
         
     else:
         raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.content_type}")
@@ -47,10 +45,8 @@ async def upload_document(
     # Note: In a real app we'd verify the project belongs to the user here.
     # We will assume project_id is valid for now.
     
-    content = await file.read()
-    
     # Extract text based on file type
-    text = extract_text_from_file(file, content)
+    text = extract_text_from_file(file)
     if not text.strip():
         raise HTTPException(status_code=400, detail="Could not extract any text from the document.")
         
@@ -337,6 +337,9 @@ def _resolve_or_create_project_for_thread(
     return project.id
 
 
+_chat_bridge_user_id: uuid.UUID | None = None
+
+
 def _get_or_create_chat_bridge_user(session: Session) -> User:
     """
     Temporary UI bridge:
@@ -344,20 +347,27 @@ def _get_or_create_chat_bridge_user(session: Session) -> User:
     For the thread-chat streaming endpoint, use a stable backend user so the UI
     can exercise the real orchestrator path without backend token wiring yet.
     """
-    existing = get_user_by_email(session=session, email=str(settings.FIRST_SUPERUSER))
-    if existing:
-        return existing
-
-    return create_user(
-        session=session,
-        user_create=UserCreate(
-            email=str(settings.FIRST_SUPERUSER),
-            password=settings.FIRST_SUPERUSER_PASSWORD,
-            is_active=True,
-            is_superuser=True,
-            full_name="Interius Chat Bridge",
-        ),
-    )
+    global _chat_bridge_user_id
+    # Once resolved, the bridge user is re-fetched by primary key; the email lookup only runs if it vanished.
+    if _chat_bridge_user_id is not None:
+        cached = session.get(User, _chat_bridge_user_id)
+        if cached:
+            return cached
+
+    user = get_user_by_email(session=session, email=str(settings.FIRST_SUPERUSER))
+    if not user:
+        user = create_user(
+            session=session,
+            user_create=UserCreate(
+                email=str(settings.FIRST_SUPERUSER),
+                password=settings.FIRST_SUPERUSER_PASSWORD,
+                is_active=True,
+                is_superuser=True,
+                full_name="Interius Chat Bridge",
+            ),
+        )
+    _chat_bridge_user_id = user.id
+    return user
 
 
 async def run_interface_then_pipeline_ui_stream(
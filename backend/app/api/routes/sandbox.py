@@ -5,16 +5,19 @@ Each project gets its own ephemeral Docker container and host port so
 thread-specific sandboxes do not overwrite each other.
 """
 import ast
+import functools
+import hashlib
 import logging
 import json
 import os
 import re
+import shlex
 import shutil
 import socket
 import subprocess
+import threading
 import time
 import uuid
-import urllib.request
 from io import StringIO
 from collections.abc import Iterable
 from pathlib import Path
@@ -41,9 +44,39 @@ SANDBOX_HOST_ROOT = Path(
 SANDBOX_CONTAINER_ROOT = Path(os.getenv("SANDBOX_CONTAINER_ROOT", "/sandbox"))
 SANDBOX_DOCKER_IMAGE = os.getenv("SANDBOX_DOCKER_IMAGE", "python:3.12-slim")
 SANDBOX_CONTAINER_WORKDIR = os.getenv("SANDBOX_CONTAINER_WORKDIR", "/workspace")
+SANDBOX_RUNTIME_FILENAME = ".sandbox-runtime.json"
 SANDBOX_PUBLIC_HOST = os.getenv("SANDBOX_PUBLIC_HOST", "localhost")
 SANDBOX_PORT_RANGE_START = int(os.getenv("SANDBOX_PORT_RANGE_START", "9100"))
 SANDBOX_PORT_RANGE_END = int(os.getenv("SANDBOX_PORT_RANGE_END", "9199"))
+SANDBOX_HEALTH_INTERVAL = os.getenv("SANDBOX_HEALTH_INTERVAL", "2s")
+SANDBOX_HEALTH_TIMEOUT = os.getenv("SANDBOX_HEALTH_TIMEOUT", "2s")
+SANDBOX_HEALTH_START_PERIOD = os.getenv("SANDBOX_HEALTH_START_PERIOD", "5s")
+# Probe faster while the container is still starting; requires Docker Engine 25 or newer.
+SANDBOX_HEALTH_START_INTERVAL = os.getenv("SANDBOX_HEALTH_START_INTERVAL", "500ms")
+SANDBOX_HEALTH_RETRIES = os.getenv("SANDBOX_HEALTH_RETRIES", "60")
+# The slim image ships without curl, so the probe uses the interpreter that runs the app.
+SANDBOX_HEALTH_CMD = (
+    "python -c \"import sys, urllib.request; "
+    "sys.exit(0 if urllib.request.urlopen('http://127.0.0.1:9000/docs', timeout=2).status < 400 else 1)\""
+)
+# Named volume shared by every sandbox container so pip downloads are fetched once per host.
+SANDBOX_PIP_CACHE_VOLUME = os.getenv("SANDBOX_PIP_CACHE_VOLUME", "prosit-sandbox-pip-cache")
+# Installed dependencies live in a volume keyed by the requirements hash, so redeploys skip pip entirely.
+SANDBOX_DEPS_DIR = "/opt/sandbox-deps"
+SANDBOX_DEPS_VOLUME_PREFIX = "prosit-sandbox-deps-"
+# Requirements are LLM-generated, so every distinct set mints a volume; each launch prunes all but the newest few.
+SANDBOX_DEPS_VOLUME_KEEP = int(os.getenv("SANDBOX_DEPS_VOLUME_KEEP", "8"))
+SANDBOX_WAIT_BASE_DELAY = 0.25
+SANDBOX_WAIT_MAX_DELAY = 4.0
+# The event stream gets most of the startup budget; the rest is left for the polling fallback.
+SANDBOX_WAIT_EVENTS_SHARE = 0.75
+SANDBOX_BASE_DEPENDENCIES = frozenset({"fastapi", "uvicorn[standard]", "sqlmodel"})
+_SANDBOX_BAKED_DOCKERFILE = (
+    f"FROM {SANDBOX_DOCKER_IMAGE}\n"
+    f"RUN python -m pip install --no-cache-dir {' '.join(shlex.quote(dep) for dep in sorted(SANDBOX_BASE_DEPENDENCIES))}\n"
+)
+SANDBOX_BAKED_IMAGE = f"prosit2-sandbox-base:{hashlib.sha256(_SANDBOX_BAKED_DOCKERFILE.encode()).hexdigest()[:12]}"
+_SANDBOX_BAKED_IMAGE_READY = threading.Event()
 SANDBOX_TESTER_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
 SANDBOX_SKIP_ROUTE_PARAM_NAMES = {
     "db",
@@ -54,6 +87,47 @@ SANDBOX_SKIP_ROUTE_PARAM_NAMES = {
     "user",
     "background_tasks",
 }
+SANDBOX_LOG_FAILURE_MARKERS = (
+    "traceback",
+    "syntaxerror",
+    "modulenotfounderror",
+    "importerror",
+    "exception:",
+    "error:",
+    "failed to",
+    "no module named",
+)
+_SANDBOX_LOG_FAILURE_RE = re.compile(
+    "|".join(re.escape(marker) for marker in SANDBOX_LOG_FAILURE_MARKERS),
+    re.IGNORECASE,
+)
+# Source rewrites run per line of every generated file, so their fixed patterns are compiled once here.
+_DATETIME_IMPORT_RE = re.compile(r"^\s*from\s+datetime\s+import\s+(.+)$")
+_SQLALCHEMY_IMPORT_RE = re.compile(r"(?m)^from\s+sqlalchemy\s+import\s+(.+)$")
+_FIELD_DECLARATION_RE = re.compile(r"^(\s*)([A-Za-z_][A-Za-z0-9_]*)\s*:\s*.*Field\(")
+_DATETIME_TYPE_FIELD_RE = re.compile(r"(?m)^\s*(date|datetime|time)\s*:\s*")
+_FIELD_FOREIGN_KEY_ARG_RE = re.compile(r"\bforeign_key\s*=\s*([^,]+),\s*")
+_FIELD_COLUMN_FLAG_RES = {
+    flag_name: re.compile(rf"\b{flag_name}\s*=\s*(True|False),\s*") for flag_name in ("primary_key", "index", "unique")
+}
+_FIELD_NULLABLE_ARG_RE = re.compile(r"\bnullable\s*=\s*(True|False),\s*")
+_FIELD_TRAILING_INDEX_RE = re.compile(r",\s*index\s*=\s*True")
+_FIELD_LEADING_INDEX_RE = re.compile(r"index\s*=\s*True,\s*")
+_BARE_ROOT_VALIDATOR_RE = re.compile(r"(?m)@root_validator\s*$")
+_TOP_LEVEL_ASSIGNMENT_RE = re.compile(r"(?m)^([A-Za-z_][A-Za-z0-9_]*)\s*=")
+_ROUTER_LIST_ASSIGNMENT_RE = re.compile(r"(?m)^router_list\s*=\s*\[")
+_GET_ROUTER_DEF_RE = re.compile(r"(?m)^def\s+get_router\s*\(")
+_EXPLICIT_INDEX_FIELD_RE = re.compile(r'Index\(\s*["\']ix_[^"\']+["\']\s*,\s*["\']([A-Za-z_][A-Za-z0-9_]*)["\']')
+_CREATE_ALL_LINE_RE = re.compile(r"(?m)^\s*SQLModel\.metadata\.create_all\(engine\)\s*$\n?")
+_ROUTER_PREFIX_DECLARATION_RE = re.compile(
+    r'(?m)^(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*=\s*APIRouter\(\s*prefix\s*=\s*["\'](?P<prefix>/[^"\']*)["\']'
+)
+_SANDBOX_PORT_LOCK = threading.Lock()
+# Ports of containers still being removed in the background; their runtime records are already gone,
+# so this set (guarded by _SANDBOX_PORT_LOCK) keeps them from being handed to a redeploy too early.
+_SANDBOX_TEARDOWN_PORTS: set[int] = set()
+# Status checks, spec fetches and proxied calls reuse pooled keep-alive connections to the sandboxes.
+_SANDBOX_HTTP_CLIENT = httpx.Client(timeout=15.0)
 
 
 class SandboxStatus(BaseModel):
@@ -92,7 +166,7 @@ def _sandbox_env_host_path(project_id: uuid.UUID) -> Path:
 
 
 def _sandbox_runtime_host_path(project_id: uuid.UUID) -> Path:
-    return _sandbox_host_dir(project_id) / ".sandbox-runtime.json"
+    return _sandbox_host_dir(project_id) / SANDBOX_RUNTIME_FILENAME
 
 
 def _sandbox_bootstrap_log_host_path(project_id: uuid.UUID) -> Path:
@@ -107,7 +181,12 @@ def _read_text_if_present(path: Path, *, max_chars: int = 4000) -> str:
     if not path.exists():
         return ""
     try:
-        text = path.read_text(encoding="utf-8", errors="replace")
+        with path.open("rb") as handle:
+            # Only the tail is ever returned, so skip the head of long logs instead of loading them whole.
+            # UTF-8 needs at most four bytes per character.
+            size = handle.seek(0, os.SEEK_END)
+            handle.seek(max(0, size - max_chars * 4))
+            text = handle.read().decode("utf-8", errors="replace")
     except Exception:
         return ""
     text = text.strip()
@@ -117,11 +196,10 @@ def _read_text_if_present(path: Path, *, max_chars: int = 4000) -> str:
 
 
 def _read_runtime_info(project_id: uuid.UUID) -> dict[str, Any] | None:
-    path = _sandbox_runtime_host_path(project_id)
-    if not path.exists():
-        return None
+    # A missing record is just another failed read, so there is no separate exists() stat.
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        with _sandbox_runtime_host_path(project_id).open("rb") as handle:
+            data = json.load(handle)
     except Exception:
         return None
     return data if isinstance(data, dict) else None
@@ -136,16 +214,18 @@ def _write_runtime_info(project_id: uuid.UUID, data: dict[str, Any]) -> None:
 
 
 def _delete_runtime_info(project_id: uuid.UUID) -> None:
-    path = _sandbox_runtime_host_path(project_id)
-    if path.exists():
-        path.unlink()
+    _sandbox_runtime_host_path(project_id).unlink(missing_ok=True)
 
 
 def _read_all_runtime_infos() -> list[dict[str, Any]]:
     infos: list[dict[str, Any]] = []
-    for runtime_path in _ensure_sandbox_root().glob("*/.sandbox-runtime.json"):
+    # One scandir pass; each record is opened directly rather than stat-ed first by a glob.
+    with os.scandir(_ensure_sandbox_root()) as entries:
+        project_dirs = [entry.path for entry in entries if entry.is_dir()]
+    for project_dir in project_dirs:
         try:
-            data = json.loads(runtime_path.read_text(encoding="utf-8"))
+            with open(os.path.join(project_dir, SANDBOX_RUNTIME_FILENAME), "rb") as handle:
+                data = json.load(handle)
         except Exception:
             continue
         if isinstance(data, dict):
@@ -165,10 +245,17 @@ def _build_project_openapi_url(port: int) -> str:
     return f"{_build_project_base_url(port).rstrip('/')}/openapi.json"
 
 
-def _docker_cmd(*args: str, check: bool = True) -> subprocess.CompletedProcess[str]:
+def _docker_cmd(
+    *args: str, check: bool = True, capture: bool = True, capture_stderr: bool = True
+) -> subprocess.CompletedProcess[str]:
+    # Fire-and-forget commands such as `rm -f` discard their output instead of buffering it.
+    output = subprocess.PIPE if capture else subprocess.DEVNULL
+    # Status probes only parse stdout; their "No such object" noise on stderr is dropped at the source.
+    error_output = subprocess.PIPE if capture and (capture_stderr or check) else subprocess.DEVNULL
     result = subprocess.run(
         ["docker", *args],
-        capture_output=True,
+        stdout=output,
+        stderr=error_output,
         text=True,
         check=False,
     )
@@ -178,6 +265,67 @@ def _docker_cmd(*args: str, check: bool = True) -> subprocess.CompletedProcess[s
     return result
 
 
+def _build_baked_sandbox_image() -> bool:
+    # The base dependencies are identical for every sandbox, so bake them into a local image once.
+    result = subprocess.run(
+        ["docker", "build", "-t", SANDBOX_BAKED_IMAGE, "-"],
+        input=_SANDBOX_BAKED_DOCKERFILE.encode(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    if result.returncode != 0:
+        # BuildKit streams its whole progress log to stderr; only the failing tail is worth decoding.
+        error_tail = (result.stderr or b"")[-4000:].decode("utf-8", errors="replace").strip()
+        logger.warning("Could not build baked sandbox image %s: %s", SANDBOX_BAKED_IMAGE, error_tail)
+    return result.returncode == 0
+
+
+def _prepare_sandbox_image() -> None:
+    try:
+        if _docker_cmd("image", "inspect", SANDBOX_DOCKER_IMAGE, check=False, capture=False).returncode != 0:
+            _docker_cmd("pull", SANDBOX_DOCKER_IMAGE, check=False, capture=False)
+        baked_exists = _docker_cmd("image", "inspect", SANDBOX_BAKED_IMAGE, check=False, capture=False).returncode == 0
+        if baked_exists or _build_baked_sandbox_image():
+            _SANDBOX_BAKED_IMAGE_READY.set()
+    except Exception as exc:
+        logger.warning("Could not pre-pull sandbox image %s: %s", SANDBOX_DOCKER_IMAGE, exc)
+
+
+def _docker_daemon_reachable(*, timeout: float = 0.1) -> bool:
+    # Connecting to the daemon socket answers "is Docker up?" without spawning `docker info`.
+    docker_host = os.getenv("DOCKER_HOST") or "unix:///var/run/docker.sock"
+    if not docker_host.startswith("unix://") or not hasattr(socket, "AF_UNIX"):
+        # TCP daemons and Docker Desktop named pipes are left for the CLI to report on.
+        return True
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(timeout)
+    try:
+        probe.connect(docker_host[len("unix://"):])
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def _docker_available() -> bool:
+    return shutil.which("docker") is not None and _docker_daemon_reachable()
+
+
+def prewarm_sandbox_image() -> None:
+    """Pull the sandbox base image and bake its base dependencies in the background."""
+    # A PATH lookup and a socket connect tell that Docker is missing; no need to spawn a thread just to fail.
+    if not _docker_available():
+        logger.info("Docker is not available; skipping sandbox image prewarm")
+        return
+    threading.Thread(target=_prepare_sandbox_image, name="sandbox-image-prewarm", daemon=True).start()
+
+
+def _sandbox_image() -> str:
+    return SANDBOX_BAKED_IMAGE if _SANDBOX_BAKED_IMAGE_READY.is_set() else SANDBOX_DOCKER_IMAGE
+
+
 def _sandbox_logs(project_id: uuid.UUID, *, max_chars: int = 4000) -> str | None:
     info = _read_runtime_info(project_id)
     container_name = str((info or {}).get("container_name") or _sandbox_container_name(project_id))
@@ -199,18 +347,7 @@ def _sandbox_logs(project_id: uuid.UUID, *, max_chars: int = 4000) -> str | None
 def _logs_look_like_failure(text: str | None) -> bool:
     if not text:
         return False
-    failure_markers = (
-        "traceback",
-        "syntaxerror",
-        "modulenotfounderror",
-        "importerror",
-        "exception:",
-        "error:",
-        "failed to",
-        "no module named",
-    )
-    lowered = text.lower()
-    return any(marker in lowered for marker in failure_markers)
+    return _SANDBOX_LOG_FAILURE_RE.search(text) is not None
 
 
 def _openapi_looks_like_fallback(spec: Any) -> bool:
@@ -240,14 +377,18 @@ def _is_host_port_available(port: int) -> bool:
 def _allocate_sandbox_port(project_id: uuid.UUID) -> int:
     existing = _read_runtime_info(project_id)
     existing_port = (existing or {}).get("port")
-    if isinstance(existing_port, int) and _is_host_port_available(existing_port):
+    if (
+        isinstance(existing_port, int)
+        and existing_port not in _SANDBOX_TEARDOWN_PORTS
+        and _is_host_port_available(existing_port)
+    ):
         return existing_port
 
     reserved_ports = {
         int(info["port"])
         for info in _read_all_runtime_infos()
         if isinstance(info.get("port"), int)
-    }
+    } | _SANDBOX_TEARDOWN_PORTS
     for port in range(SANDBOX_PORT_RANGE_START, SANDBOX_PORT_RANGE_END + 1):
         if port in reserved_ports:
             continue
@@ -256,17 +397,30 @@ def _allocate_sandbox_port(project_id: uuid.UUID) -> int:
     raise HTTPException(status_code=500, detail="No free sandbox ports are available.")
 
 
-def _docker_container_state(container_name: str) -> tuple[bool, bool]:
+def _docker_container_state(container_name: str) -> tuple[bool, bool, str | None]:
+    """Return whether the container exists, whether it is running, and its health status if it has one."""
     result = _docker_cmd(
         "inspect",
         "-f",
-        "{{.State.Running}}",
+        "{{.State.Running}} {{if .State.Health}}{{.State.Health.Status}}{{end}}",
         container_name,
         check=False,
+        capture_stderr=False,
     )
     if result.returncode != 0:
-        return False, False
-    return True, result.stdout.strip().lower() == "true"
+        return False, False, None
+    running, _, health = result.stdout.strip().partition(" ")
+    return True, running.lower() == "true", health.strip() or None
+
+
+def _docker_container_health(container_name: str) -> str | None:
+    """Return Docker's health status for the container, or ``"exited"`` once it has stopped."""
+    exists, is_running, health = _docker_container_state(container_name)
+    if not exists:
+        return None
+    if not is_running:
+        return "exited"
+    return health
 
 
 def _sandbox_internal_base_url(project_id: uuid.UUID) -> str | None:
@@ -283,28 +437,130 @@ def _is_sandbox_live(project_id: uuid.UUID) -> bool:
     if not isinstance(port, int):
         return False
     try:
-        with urllib.request.urlopen(_build_project_docs_url(port), timeout=3) as response:
-            return 200 <= getattr(response, "status", 200) < 400
+        response = _SANDBOX_HTTP_CLIENT.get(_build_project_docs_url(port), timeout=3.0)
+        return 200 <= response.status_code < 400
     except Exception:
         return False
 
 
+def _is_port_open(port: int, *, timeout: float = 0.5) -> bool:
+    try:
+        with socket.create_connection((SANDBOX_PUBLIC_HOST, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _probe_sandbox_docs(port: int) -> bool:
+    # While uvicorn is still installing dependencies a bare connect fails far more cheaply than an HTTP request.
+    if not _is_port_open(port):
+        return False
+    try:
+        response = _SANDBOX_HTTP_CLIENT.get(_build_project_docs_url(port), timeout=3.0)
+    except httpx.HTTPError:
+        return False
+    return 200 <= response.status_code < 400
+
+
+def _await_sandbox_health_event(container_name: str, *, since: int, timeout_seconds: float) -> bool | None:
+    """Block on Docker's event stream until the container turns healthy or dies.
+
+    Returns ``None`` when no decisive event arrived so callers can fall back to polling.
+    """
+    try:
+        process = subprocess.Popen(
+            [
+                "docker",
+                "events",
+                "--filter",
+                f"container={container_name}",
+                "--filter",
+                "event=health_status",
+                "--filter",
+                "event=die",
+                "--since",
+                str(since),
+                "--until",
+                str(int(time.time() + timeout_seconds) + 1),
+                "--format",
+                "{{.Status}}",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except OSError:
+        return None
+    try:
+        for line in process.stdout or ():
+            status = line.strip()
+            if status == "health_status: healthy":
+                return True
+            if status in {"die", "health_status: unhealthy"}:
+                return False
+    finally:
+        process.kill()
+        process.wait()
+    return None
+
+
 def _wait_for_sandbox(project_id: uuid.UUID, timeout_seconds: int = 30) -> bool:
-    deadline = time.time() + timeout_seconds
-    while time.time() < deadline:
-        if _is_sandbox_live(project_id):
+    info = _read_runtime_info(project_id)
+    container_name = str((info or {}).get("container_name") or _sandbox_container_name(project_id))
+    port = (info or {}).get("port")
+    deadline = time.monotonic() + timeout_seconds
+    started_at = (info or {}).get("started_at")
+    if isinstance(started_at, int):
+        # --since replays events emitted before we subscribed, so a fast start is not missed.
+        is_healthy = _await_sandbox_health_event(
+            container_name, since=started_at, timeout_seconds=timeout_seconds * SANDBOX_WAIT_EVENTS_SHARE
+        )
+        if is_healthy is not None:
+            return is_healthy
+    attempt = 0
+    while time.monotonic() < deadline:
+        # Docker runs the readiness probe itself; an exited container will never become healthy.
+        health = _docker_container_health(container_name)
+        if health in {"exited", "unhealthy"}:
+            return False
+        if health == "healthy":
             return True
-        time.sleep(1)
+        if health is None and isinstance(port, int) and _probe_sandbox_docs(port):
+            return True
+        delay = min(SANDBOX_WAIT_MAX_DELAY, SANDBOX_WAIT_BASE_DELAY * 2 ** min(attempt, 5))
+        time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+        attempt += 1
     return False
 
 
 def _stop_project_sandbox(project_id: uuid.UUID) -> None:
     info = _read_runtime_info(project_id)
     container_name = str((info or {}).get("container_name") or _sandbox_container_name(project_id))
-    _docker_cmd("rm", "-f", container_name, check=False)
+    _docker_cmd("rm", "-f", container_name, check=False, capture=False)
+
+
+def _running_container_names(container_names: list[str]) -> set[str]:
+    if not container_names:
+        return set()
+    # One inspect call covers every sandbox; missing containers only make it exit non-zero.
+    result = _docker_cmd(
+        "inspect",
+        "-f",
+        "{{.Name}} {{.State.Running}}",
+        *container_names,
+        check=False,
+        capture_stderr=False,
+    )
+    running: set[str] = set()
+    for line in (result.stdout or "").splitlines():
+        name, _, state = line.strip().partition(" ")
+        if state.lower() == "true":
+            running.add(name.lstrip("/"))
+    return running
 
 
 def _first_running_runtime() -> tuple[uuid.UUID, dict[str, Any]] | None:
+    candidates: list[tuple[uuid.UUID, str, dict[str, Any]]] = []
     for info in _read_all_runtime_infos():
         project_id_raw = info.get("project_id")
         container_name = str(info.get("container_name") or "")
@@ -312,8 +568,11 @@ def _first_running_runtime() -> tuple[uuid.UUID, dict[str, Any]] | None:
             project_id = uuid.UUID(str(project_id_raw))
         except (TypeError, ValueError):
             continue
-        _, is_running = _docker_container_state(container_name)
-        if is_running:
+        if container_name:
+            candidates.append((project_id, container_name, info))
+    running = _running_container_names([container_name for _, container_name, _ in candidates])
+    for project_id, container_name, info in candidates:
+        if container_name in running:
             return project_id, info
     return None
 
@@ -355,9 +614,9 @@ def _build_sandbox_status(project_id: uuid.UUID | None = None) -> SandboxStatus:
     swagger_url = _build_project_docs_url(port) if isinstance(port, int) else None
     logs = _sandbox_logs(resolved_project_id)
     container_name = str((runtime_info or {}).get("container_name") or _sandbox_container_name(resolved_project_id))
-    exists, is_running = _docker_container_state(container_name)
-
-    if is_running and _is_sandbox_live(resolved_project_id):
+    exists, is_running, health = _docker_container_state(container_name)
+    # Docker already probes the app for us; only fall back to an HTTP request for containers without a health check.
+    if is_running and (health == "healthy" if health is not None else _is_sandbox_live(resolved_project_id)):
         return SandboxStatus(
             status="running",
             message="Sandbox API is live.",
@@ -553,21 +812,26 @@ def _build_entity_samples(requirements_artifact: dict[str, Any]) -> dict[str, di
     return entity_samples
 
 
+_MODELED_FALLBACK_ENTITY = {"id": 1, "name": "Sample item", "description": "Sample description"}
+_MODELED_LOGIN_BODY = {"email": "user@example.com", "password": "P@ssw0rd123"}
+_MODELED_SIGNUP_BODY = {**_MODELED_LOGIN_BODY, "full_name": "Sample User"}
+
+
 def _sample_entity_for_path(path: str, entity_samples: dict[str, dict[str, Any]]) -> dict[str, Any]:
     static_segments = [segment for segment in str(path or "").split("/") if segment and not segment.startswith("{")]
     for segment in reversed(static_segments):
         sample = entity_samples.get(_singularize_name(segment)) or entity_samples.get(segment.lower())
         if sample:
             return dict(sample)
-    return {"id": 1, "name": "Sample item", "description": "Sample description"}
+    return dict(_MODELED_FALLBACK_ENTITY)
 
 
 def _build_modeled_auth_request_body(path: str) -> dict[str, Any] | None:
     lowered = str(path or "").lower()
     if lowered.endswith("/login"):
-        return {"email": "user@example.com", "password": "P@ssw0rd123"}
+        return dict(_MODELED_LOGIN_BODY)
     if lowered.endswith("/signup") or lowered.endswith("/register"):
-        return {"email": "user@example.com", "password": "P@ssw0rd123", "full_name": "Sample User"}
+        return dict(_MODELED_SIGNUP_BODY)
     return None
 
 
@@ -577,7 +841,8 @@ def _build_modeled_request_body(method: str, path: str, entity_samples: dict[str
     auth_body = _build_modeled_auth_request_body(path)
     if auth_body is not None:
         return auth_body
-    sample = dict(_sample_entity_for_path(path, entity_samples))
+    # _sample_entity_for_path already hands back a private copy, so it can be mutated directly.
+    sample = _sample_entity_for_path(path, entity_samples)
     if method.upper() == "POST":
         sample.pop("id", None)
     return sample
@@ -781,14 +1046,17 @@ def _get_project_for_thread_or_404(thread_id: str, session: Session) -> Project:
     return project
 
 
+def _top_level_assignments(source: str) -> set[str]:
+    return set(_TOP_LEVEL_ASSIGNMENT_RE.findall(source))
+
+
 def _rewrite_datetime_type_name_collisions(content: str) -> str:
-    datetime_import_pattern = re.compile(r"^\s*from\s+datetime\s+import\s+(.+)$")
     lines = content.splitlines()
     imported_names: set[str] = set()
     import_line_indexes: set[int] = set()
 
     for idx, line in enumerate(lines):
-        match = datetime_import_pattern.match(line)
+        match = _DATETIME_IMPORT_RE.match(line)
         if not match:
             continue
         import_line_indexes.add(idx)
@@ -806,17 +1074,13 @@ def _rewrite_datetime_type_name_collisions(content: str) -> str:
     if not imported_names:
         return content
 
-    collision_names = {
-        name
-        for name in imported_names
-        if re.search(rf"(?m)^\s*{name}\s*:\s*", content)
-    }
+    collision_names = imported_names & set(_DATETIME_TYPE_FIELD_RE.findall(content))
     if not collision_names:
         return content
 
     for idx in import_line_indexes:
         line = lines[idx]
-        match = datetime_import_pattern.match(line)
+        match = _DATETIME_IMPORT_RE.match(line)
         if not match:
             continue
         rewritten_parts: list[str] = []
@@ -881,22 +1145,22 @@ def _rewrite_inline_field_sa_column_conflicts(line: str) -> tuple[str, bool]:
     field_column_flags: list[str] = []
     requires_foreign_key = False
 
-    foreign_key_match = re.search(r"\bforeign_key\s*=\s*([^,]+),\s*", rewritten)
+    foreign_key_match = _FIELD_FOREIGN_KEY_ARG_RE.search(rewritten)
     if foreign_key_match:
         foreign_key_value = foreign_key_match.group(1).strip()
         foreign_key_args.append(f"ForeignKey({foreign_key_value})")
         requires_foreign_key = True
         rewritten = rewritten[: foreign_key_match.start()] + rewritten[foreign_key_match.end() :]
 
-    for flag_name in ("primary_key", "index", "unique"):
-        flag_match = re.search(rf"\b{flag_name}\s*=\s*(True|False),\s*", rewritten)
+    for flag_name, flag_re in _FIELD_COLUMN_FLAG_RES.items():
+        flag_match = flag_re.search(rewritten)
         if not flag_match:
             continue
         if flag_match.group(1) == "True":
             field_column_flags.append(f"{flag_name}=True")
         rewritten = rewritten[: flag_match.start()] + rewritten[flag_match.end() :]
 
-    rewritten = re.sub(r"\bnullable\s*=\s*(True|False),\s*", "", rewritten)
+    rewritten = _FIELD_NULLABLE_ARG_RE.sub("", rewritten)
 
     if foreign_key_args or field_column_flags:
         rewritten = _inject_sa_column_args(rewritten, foreign_key_args, field_column_flags)
@@ -952,12 +1216,14 @@ def _inject_sa_column_args(line: str, foreign_key_args: list[str], field_column_
     return f"{line[:inner_start]}{inner}{line[inner_end:]}"
 
 
+# Repair passes rewrite the whole bundle, so unchanged files hit this cache instead of being re-normalized.
+@functools.lru_cache(maxsize=256)
 def _normalize_sandbox_source(path: str, content: str) -> str:
     normalized_path = path.replace("\\", "/").lower()
     normalized = content
     normalized = normalized.replace("from .database import get_db", "from .database import get_db, engine")
     normalized = normalized.replace("bind=get_db().bind", "bind=engine")
-    normalized = re.sub(r"@root_validator\s*$", "@root_validator(skip_on_failure=True)", normalized, flags=re.MULTILINE)
+    normalized = _BARE_ROOT_VALIDATOR_RE.sub("@root_validator(skip_on_failure=True)", normalized)
     normalized = _rewrite_datetime_type_name_collisions(normalized)
 
     if normalized_path.endswith(".py"):
@@ -1036,13 +1302,12 @@ def _normalize_sandbox_source(path: str, content: str) -> str:
 
         normalized = "\n".join(rewritten_lines)
         if requires_sqlalchemy_foreign_key:
-            sqlalchemy_import_pattern = re.compile(r"(?m)^from\s+sqlalchemy\s+import\s+(.+)$")
-            sqlalchemy_import_match = sqlalchemy_import_pattern.search(normalized)
+            sqlalchemy_import_match = _SQLALCHEMY_IMPORT_RE.search(normalized)
             if sqlalchemy_import_match:
                 imported_symbols = [part.strip() for part in sqlalchemy_import_match.group(1).split(",") if part.strip()]
                 if "ForeignKey" not in imported_symbols:
                     imported_symbols.append("ForeignKey")
-                    normalized = sqlalchemy_import_pattern.sub(
+                    normalized = _SQLALCHEMY_IMPORT_RE.sub(
                         f"from sqlalchemy import {', '.join(imported_symbols)}",
                         normalized,
                         count=1,
@@ -1051,7 +1316,7 @@ def _normalize_sandbox_source(path: str, content: str) -> str:
                 normalized = "from sqlalchemy import ForeignKey\n" + normalized
 
     if normalized_path.endswith("database.py") and "def get_engine" in normalized:
-        has_top_level_engine = bool(re.search(r"(?m)^engine\s*=", normalized))
+        has_top_level_engine = "engine" in _top_level_assignments(normalized)
         if not has_top_level_engine:
             normalized = (
                 normalized.rstrip()
@@ -1061,9 +1326,8 @@ def _normalize_sandbox_source(path: str, content: str) -> str:
 
     if normalized_path.endswith("schemas.py"):
         has_create_model = "class CalculationCreate(" in normalized
-        has_request_model = "class CalculationRequest(" in normalized or re.search(
-            r"(?m)^CalculationRequest\s*=",
-            normalized,
+        has_request_model = "class CalculationRequest(" in normalized or "CalculationRequest" in _top_level_assignments(
+            normalized
         )
         if has_create_model and not has_request_model:
             normalized = (
@@ -1073,10 +1337,11 @@ def _normalize_sandbox_source(path: str, content: str) -> str:
             )
 
         # Common auth-schema drift in generated apps.
-        has_token_model = "class Token(" in normalized or re.search(r"(?m)^Token\s*=", normalized)
-        has_token_response = "class TokenResponse(" in normalized or re.search(r"(?m)^TokenResponse\s*=", normalized)
-        has_login_request = "class LoginRequest(" in normalized or re.search(r"(?m)^LoginRequest\s*=", normalized)
-        has_token_request = "class TokenRequest(" in normalized or re.search(r"(?m)^TokenRequest\s*=", normalized)
+        assigned_names = _top_level_assignments(normalized)
+        has_token_model = "class Token(" in normalized or "Token" in assigned_names
+        has_token_response = "class TokenResponse(" in normalized or "TokenResponse" in assigned_names
+        has_login_request = "class LoginRequest(" in normalized or "LoginRequest" in assigned_names
+        has_token_request = "class TokenRequest(" in normalized or "TokenRequest" in assigned_names
         auth_aliases: list[str] = []
         if has_token_model and not has_token_response:
             auth_aliases.append("TokenResponse = Token")
@@ -1091,9 +1356,9 @@ def _normalize_sandbox_source(path: str, content: str) -> str:
             )
 
     if normalized_path.endswith("routes.py"):
-        has_router_list = re.search(r"(?m)^router_list\s*=\s*\[", normalized) is not None
-        has_api_router = re.search(r"(?m)^api_router\s*=", normalized) is not None
-        has_get_router = re.search(r"(?m)^def\s+get_router\s*\(", normalized) is not None
+        has_router_list = _ROUTER_LIST_ASSIGNMENT_RE.search(normalized) is not None
+        has_api_router = "api_router" in _top_level_assignments(normalized)
+        has_get_router = _GET_ROUTER_DEF_RE.search(normalized) is not None
         if has_router_list and not has_api_router:
             normalized = (
                 normalized.rstrip()
@@ -1119,10 +1384,11 @@ def _normalize_sandbox_source(path: str, content: str) -> str:
             )
 
         auth_aliases: list[str] = []
-        has_hash_password = "def hash_password(" in normalized or re.search(r"(?m)^hash_password\s*=", normalized)
-        has_get_password_hash = "def get_password_hash(" in normalized or re.search(r"(?m)^get_password_hash\s*=", normalized)
-        has_get_current_user = "def get_current_user(" in normalized or re.search(r"(?m)^get_current_user\s*=", normalized)
-        has_current_user = "def current_user(" in normalized or re.search(r"(?m)^current_user\s*=", normalized)
+        assigned_names = _top_level_assignments(normalized)
+        has_hash_password = "def hash_password(" in normalized or "hash_password" in assigned_names
+        has_get_password_hash = "def get_password_hash(" in normalized or "get_password_hash" in assigned_names
+        has_get_current_user = "def get_current_user(" in normalized or "get_current_user" in assigned_names
+        has_current_user = "def current_user(" in normalized or "current_user" in assigned_names
         if has_hash_password and not has_get_password_hash:
             auth_aliases.append("get_password_hash = hash_password")
         if has_get_current_user and not has_current_user:
@@ -1385,10 +1651,9 @@ def _build_internal_sandbox_url(project_id: uuid.UUID, path: str, query_params:
 
 def _fetch_sandbox_json(url: str) -> Any:
     try:
-        with httpx.Client(timeout=15.0) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            return response.json()
+        response = _SANDBOX_HTTP_CLIENT.get(url)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=502, detail=f"Sandbox returned {exc.response.status_code}.") from exc
     except httpx.HTTPError as exc:
@@ -1421,10 +1686,7 @@ def _augment_sandbox_dependencies(files: list[dict[str, Any]], dependencies: lis
 def _remove_duplicate_field_indexes(content: str) -> str:
     explicit_index_fields = {
         match.group(1)
-        for match in re.finditer(
-            r'Index\(\s*["\']ix_[^"\']+["\']\s*,\s*["\']([A-Za-z_][A-Za-z0-9_]*)["\']',
-            content,
-        )
+        for match in _EXPLICIT_INDEX_FIELD_RE.finditer(content)
     }
     if not explicit_index_fields:
         return content
@@ -1434,7 +1696,7 @@ def _remove_duplicate_field_indexes(content: str) -> str:
     idx = 0
     while idx < len(lines):
         line = lines[idx]
-        field_match = re.match(r"^(\s*)([A-Za-z_][A-Za-z0-9_]*)\s*:\s*.*Field\(", line)
+        field_match = _FIELD_DECLARATION_RE.match(line)
         if not field_match:
             rewritten_lines.append(line)
             idx += 1
@@ -1457,8 +1719,8 @@ def _remove_duplicate_field_indexes(content: str) -> str:
                 if stripped.startswith("index="):
                     continue
                 if "Field(" in block_line or "index=" in block_line:
-                    block_line = re.sub(r",\s*index\s*=\s*True", "", block_line)
-                    block_line = re.sub(r"index\s*=\s*True,\s*", "", block_line)
+                    block_line = _FIELD_TRAILING_INDEX_RE.sub("", block_line)
+                    block_line = _FIELD_LEADING_INDEX_RE.sub("", block_line)
                 rewritten_block.append(block_line)
             block = rewritten_block
 
@@ -1467,54 +1729,95 @@ def _remove_duplicate_field_indexes(content: str) -> str:
     return "\n".join(rewritten_lines)
 
 
-def _dedupe_sandbox_schema_bootstrap(sandbox_dir: Path) -> None:
-    database_path = sandbox_dir / "app" / "database.py"
-    main_path = sandbox_dir / "app" / "main.py"
-    if not database_path.exists() or not main_path.exists():
-        return
-
-    database_source = database_path.read_text(encoding="utf-8")
+def _strip_duplicate_create_all(main_source: str, database_source: str) -> str:
     if "SQLModel.metadata.create_all(" not in database_source:
-        return
-
-    main_source = main_path.read_text(encoding="utf-8")
-    normalized_main = re.sub(
-        r"(?m)^\s*SQLModel\.metadata\.create_all\(engine\)\s*$\n?",
-        "",
-        main_source,
-    )
-    if normalized_main != main_source:
-        main_path.write_text(normalized_main, encoding="utf-8", newline="\n")
-
+        return main_source
+    return _CREATE_ALL_LINE_RE.sub("", main_source)
 
-def _dedupe_router_prefixes(sandbox_dir: Path) -> None:
-    routes_path = sandbox_dir / "app" / "routes.py"
-    main_path = sandbox_dir / "app" / "main.py"
-    if not routes_path.exists() or not main_path.exists():
-        return
 
-    route_source = routes_path.read_text(encoding="utf-8")
+def _strip_duplicate_router_prefixes(main_source: str, route_source: str) -> str:
     router_prefixes = {
         match.group("name"): match.group("prefix")
-        for match in re.finditer(
-            r'(?m)^(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*=\s*APIRouter\(\s*prefix\s*=\s*["\'](?P<prefix>/[^"\']*)["\']',
-            route_source,
-        )
+        for match in _ROUTER_PREFIX_DECLARATION_RE.finditer(route_source)
     }
-    if not router_prefixes:
-        return
-
-    main_source = main_path.read_text(encoding="utf-8")
     normalized_main = main_source
     for router_name, prefix in router_prefixes.items():
+        # Built from the generated router's name and prefix, so this one cannot be compiled ahead of time.
         normalized_main = re.sub(
             rf'(?m)(app\.include_router\(\s*{re.escape(router_name)}\s*,\s*)prefix\s*=\s*["\']{re.escape(prefix)}["\']\s*,\s*',
             r"\1",
             normalized_main,
         )
+    return normalized_main
+
+
+def _begin_previous_sandbox_teardown(project_id: uuid.UUID) -> threading.Thread | None:
+    """Force-remove the project's previous container on a background thread.
+
+    The container name has to be captured up front because rewriting the bundle wipes the runtime record.
+    Its port stays reserved until the removal finishes, since a bind probe from inside the api container
+    cannot see a host port that the old container still publishes.
+    """
+    runtime_info = _read_runtime_info(project_id) or {}
+    container_name = runtime_info.get("container_name")
+    if not container_name:
+        return None
+    port = runtime_info.get("port")
+    if isinstance(port, int):
+        with _SANDBOX_PORT_LOCK:
+            _SANDBOX_TEARDOWN_PORTS.add(port)
 
-    if normalized_main != main_source:
-        main_path.write_text(normalized_main, encoding="utf-8", newline="\n")
+    def _remove_container() -> None:
+        try:
+            _docker_cmd("rm", "-f", str(container_name), check=False, capture=False)
+        finally:
+            if isinstance(port, int):
+                with _SANDBOX_PORT_LOCK:
+                    _SANDBOX_TEARDOWN_PORTS.discard(port)
+
+    teardown = threading.Thread(target=_remove_container, daemon=True)
+    teardown.start()
+    return teardown
+
+
+_SANDBOX_FALLBACK_EXCEPTIONS_SOURCE = (
+    b"class NotFoundError(Exception):\n"
+    b"    pass\n\n"
+    b"class DomainValidationError(Exception):\n"
+    b"    pass\n\n"
+    b"class ValidationError(Exception):\n"
+    b"    pass\n"
+)
+# Everything after the per-project banner is static, so it is rendered and encoded once at import time.
+_SANDBOX_ENTRYPOINT_BODY = f"""cd "{SANDBOX_CONTAINER_WORKDIR}"
+set -a
+[ -f ".env" ] && . "./.env"
+set +a
+# Deploys with identical requirements share the volume; the lock keeps concurrent installs from interleaving.
+(
+    flock 9
+    if [ ! -f "{SANDBOX_DEPS_DIR}/.installed" ]; then
+        # System site-packages exposes the dependencies baked into the image, so pip only adds what is missing.
+        python -m venv --system-site-packages "{SANDBOX_DEPS_DIR}"
+        "{SANDBOX_DEPS_DIR}/bin/python" -m pip install -q -r requirements.txt
+        touch "{SANDBOX_DEPS_DIR}/.installed"
+    fi
+) 9>"{SANDBOX_DEPS_DIR}/.install.lock"
+export PATH="{SANDBOX_DEPS_DIR}/bin:$PATH"
+
+if [ -f "app/main.py" ]; then
+    MODULE="app.main:app"
+elif [ -f "main.py" ]; then
+    MODULE="main:app"
+else
+    MODULE=$(grep -rl "FastAPI()" . --include="*.py" | head -1 | sed 's|^./||;s|/|.|g;s|.py$||'):app
+fi
+
+echo "Launching uvicorn module $MODULE"
+# Run through the venv interpreter: with --system-site-packages, pip never installs a venv uvicorn
+# script, so a bare `uvicorn` would resolve to system Python and miss the project's extra packages.
+exec "{SANDBOX_DEPS_DIR}/bin/python" -m uvicorn "$MODULE" --host 0.0.0.0 --port "${{PORT:-9000}}"
+""".encode()
 
 
 def _write_sandbox_bundle(
@@ -1526,57 +1829,57 @@ def _write_sandbox_bundle(
 ) -> None:
     sandbox_dir = _sandbox_host_dir(project_id)
     db_token = uuid.uuid4().hex[:8]
+    # Fire-and-forget: the new container gets its own name and port, so nothing waits on the old one's removal.
+    _begin_previous_sandbox_teardown(project_id)
     if sandbox_dir.exists():
         shutil.rmtree(sandbox_dir)
     sandbox_dir.mkdir(parents=True, exist_ok=True)
 
+    # The bundle is assembled and fixed up in memory, then written once; no file is re-read after writing.
+    bundle: dict[str, str] = {}
     for file_entry in files:
         relative_path = str(file_entry["path"]).replace("\\", "/").lstrip("/")
-        file_path = sandbox_dir / relative_path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-
         raw_content = str(file_entry.get("content") or "")
-        content = (
-            _normalize_sandbox_source(relative_path, raw_content)
-            if normalize_generated_code
-            else raw_content
-        )
+        content = raw_content
+        if normalize_generated_code:
+            content = _normalize_sandbox_source(relative_path, raw_content)
+            # Model files are post-processed in memory so the bundle never needs a directory walk.
+            if relative_path.rpartition("/")[2] == "models.py":
+                content = _remove_duplicate_field_indexes(content)
+        bundle[relative_path] = content
 
+    if normalize_generated_code:
+        main_source = bundle.get("app/main.py")
+        if main_source is not None:
+            if "app/database.py" in bundle:
+                main_source = _strip_duplicate_create_all(main_source, bundle["app/database.py"])
+            if "app/routes.py" in bundle:
+                main_source = _strip_duplicate_router_prefixes(main_source, bundle["app/routes.py"])
+            bundle["app/main.py"] = main_source
+
+    created_dirs: set[Path] = set()
+    for relative_path, content in bundle.items():
+        file_path = sandbox_dir / relative_path
+        if file_path.parent not in created_dirs:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(file_path.parent)
         file_path.write_text(content, encoding="utf-8")
-        logger.info("Wrote sandbox file: %s", file_path)
+        logger.debug("Wrote sandbox file: %s", file_path)
 
-    if normalize_generated_code:
-        for model_path in sandbox_dir.rglob("models.py"):
-            source = model_path.read_text(encoding="utf-8")
-            rewritten = _remove_duplicate_field_indexes(source)
-            if rewritten != source:
-                model_path.write_text(rewritten, encoding="utf-8", newline="\n")
+    logger.info("Wrote %s sandbox file(s) to %s", len(files), sandbox_dir)
 
-    if normalize_generated_code:
+    if normalize_generated_code and "app/exceptions.py" not in bundle:
         # Ensure app/exceptions.py exists to prevent import errors in generated code
         exceptions_path = sandbox_dir / "app" / "exceptions.py"
-        if not exceptions_path.exists():
-            exceptions_path.parent.mkdir(parents=True, exist_ok=True)
-            exceptions_path.write_text(
-                "class NotFoundError(Exception):\n"
-                "    pass\n\n"
-                "class DomainValidationError(Exception):\n"
-                "    pass\n\n"
-                "class ValidationError(Exception):\n"
-                "    pass\n",
-                encoding="utf-8"
-            )
-            logger.info("Wrote fallback exceptions file: %s", exceptions_path)
-
-        _dedupe_sandbox_schema_bootstrap(sandbox_dir)
-        _dedupe_router_prefixes(sandbox_dir)
+        exceptions_path.parent.mkdir(parents=True, exist_ok=True)
+        exceptions_path.write_bytes(_SANDBOX_FALLBACK_EXCEPTIONS_SOURCE)
+        logger.info("Wrote fallback exceptions file: %s", exceptions_path)
 
     inferred_deps = _augment_sandbox_dependencies(files, dependencies) if normalize_generated_code else {
         str(dep).strip() for dep in dependencies if str(dep).strip()
     }
-    base_deps = {"fastapi", "uvicorn[standard]", "sqlmodel"}
     reqs_path = sandbox_dir / "requirements.txt"
-    reqs_path.write_text("\n".join(sorted(base_deps | inferred_deps)), encoding="utf-8", newline="\n")
+    reqs_path.write_text("\n".join(sorted(SANDBOX_BASE_DEPENDENCIES | inferred_deps)), encoding="utf-8", newline="\n")
 
     env_path = _sandbox_env_host_path(project_id)
     env_path.write_text(
@@ -1594,52 +1897,68 @@ def _write_sandbox_bundle(
         newline="\n",
     )
 
-    sandbox_container_dir = SANDBOX_CONTAINER_WORKDIR
     launcher = sandbox_dir / "container_entrypoint.sh"
-    launcher.write_text(
-        f"""#!/bin/sh
-set -e
-echo "Preparing sandbox for project {project_id}"
-cd "{sandbox_container_dir}"
-set -a
-[ -f ".env" ] && . "./.env"
-set +a
-python -m pip install -q -r requirements.txt
+    launcher.write_bytes(
+        f'#!/bin/sh\nset -e\necho "Preparing sandbox for project {project_id}"\n'.encode() + _SANDBOX_ENTRYPOINT_BODY
+    )
+    launcher.chmod(0o755)
 
-if [ -f "app/main.py" ]; then
-    MODULE="app.main:app"
-elif [ -f "main.py" ]; then
-    MODULE="main:app"
-else
-    MODULE=$(grep -rl "FastAPI()" . --include="*.py" | head -1 | sed 's|^./||;s|/|.|g;s|.py$||'):app
-fi
 
-echo "Launching uvicorn module $MODULE"
-exec uvicorn "$MODULE" --host 0.0.0.0 --port "${{PORT:-9000}}"
-""",
-        encoding="utf-8",
-        newline="\n",
+def _sandbox_deps_volume(sandbox_dir: Path, image: str) -> str:
+    requirements_path = sandbox_dir / "requirements.txt"
+    requirements = requirements_path.read_bytes() if requirements_path.exists() else b""
+    digest = hashlib.sha256(image.encode() + b"\n" + requirements).hexdigest()
+    return f"{SANDBOX_DEPS_VOLUME_PREFIX}{digest[:16]}"
+
+
+def _prune_sandbox_deps_volumes() -> None:
+    """Remove all but the newest SANDBOX_DEPS_VOLUME_KEEP dependency volumes.
+
+    Volumes recorded by a runtime record are always kept; Docker itself refuses to remove mounted ones.
+    """
+    listed = _docker_cmd(
+        "volume", "ls", "-q", "--filter", f"name={SANDBOX_DEPS_VOLUME_PREFIX}", check=False, capture_stderr=False
     )
-    launcher.chmod(0o755)
+    names = [name for name in (listed.stdout or "").split() if name.startswith(SANDBOX_DEPS_VOLUME_PREFIX)]
+    if listed.returncode != 0 or len(names) <= SANDBOX_DEPS_VOLUME_KEEP:
+        return
+    inspected = _docker_cmd(
+        "volume", "inspect", "-f", "{{.CreatedAt}} {{.Name}}", *names, check=False, capture_stderr=False
+    )
+    if inspected.returncode != 0:
+        return
+    in_use = {info.get("deps_volume") for info in _read_all_runtime_infos()}
+    # CreatedAt is RFC 3339, so newest-first is a plain reverse string sort.
+    by_age = sorted((line.rsplit(" ", 1) for line in inspected.stdout.splitlines() if line.strip()), reverse=True)
+    for _created_at, name in by_age[SANDBOX_DEPS_VOLUME_KEEP:]:
+        if name not in in_use:
+            _docker_cmd("volume", "rm", name, check=False, capture=False)
 
 
 def _launch_project_sandbox(project_id: uuid.UUID, *, sandbox_mode: str = "normalized") -> None:
     sandbox_dir = _sandbox_host_dir(project_id).resolve()
     container_name = _sandbox_container_name(project_id)
-    _stop_project_sandbox(project_id)
-    # Defensively clear any stale container with the same name even if runtime metadata was stale.
-    _docker_cmd("rm", "-f", container_name, check=False)
-    port = _allocate_sandbox_port(project_id)
-
-    runtime_info = {
-        "project_id": str(project_id),
-        "container_name": container_name,
-        "port": port,
-        "mode": sandbox_mode,
-        "host_dir": str(sandbox_dir),
-        "started_at": int(time.time()),
-    }
-    _write_runtime_info(project_id, runtime_info)
+    previous_container_name = (_read_runtime_info(project_id) or {}).get("container_name")
+    if previous_container_name:
+        # Rewriting the bundle normally hands the old container to a background teardown already.
+        _docker_cmd("rm", "-f", str(previous_container_name), check=False, capture=False)
+    # Concurrent deploys run on separate worker threads; the runtime record is what reserves a port,
+    # so allocation and the write are kept atomic to hand each sandbox a distinct port.
+    image = _sandbox_image()
+    deps_volume = _sandbox_deps_volume(sandbox_dir, image)
+    with _SANDBOX_PORT_LOCK:
+        port = _allocate_sandbox_port(project_id)
+
+        runtime_info = {
+            "project_id": str(project_id),
+            "container_name": container_name,
+            "port": port,
+            "deps_volume": deps_volume,
+            "mode": sandbox_mode,
+            "host_dir": str(sandbox_dir),
+            "started_at": int(time.time()),
+        }
+        _write_runtime_info(project_id, runtime_info)
 
     docker_run_args = (
         "run",
@@ -1650,16 +1969,41 @@ def _launch_project_sandbox(project_id: uuid.UUID, *, sandbox_mode: str = "norma
         f"{port}:9000",
         "-v",
         f"{sandbox_dir}:{SANDBOX_CONTAINER_WORKDIR}",
+        "-v",
+        f"{SANDBOX_PIP_CACHE_VOLUME}:/root/.cache/pip",
+        "-v",
+        f"{deps_volume}:{SANDBOX_DEPS_DIR}",
+        # The sandbox SQLite databases live under /tmp and are disposable, so keep them in memory.
+        "--tmpfs",
+        "/tmp",
         "-w",
         SANDBOX_CONTAINER_WORKDIR,
-        SANDBOX_DOCKER_IMAGE,
+        "--health-cmd",
+        SANDBOX_HEALTH_CMD,
+        "--health-interval",
+        SANDBOX_HEALTH_INTERVAL,
+        "--health-timeout",
+        SANDBOX_HEALTH_TIMEOUT,
+        "--health-start-period",
+        SANDBOX_HEALTH_START_PERIOD,
+        "--health-retries",
+        SANDBOX_HEALTH_RETRIES,
+        "--health-start-interval",
+        SANDBOX_HEALTH_START_INTERVAL,
+        image,
         "sh",
         f"{SANDBOX_CONTAINER_WORKDIR}/container_entrypoint.sh",
     )
     result = _docker_cmd(*docker_run_args, check=False)
     stderr = (result.stderr or result.stdout or "").strip()
+    if result.returncode != 0 and "unknown flag" in stderr and "--health-start-interval" in stderr:
+        # Older Docker engines reject the start interval; fall back to the steady-state interval only.
+        flag_index = docker_run_args.index("--health-start-interval")
+        docker_run_args = docker_run_args[:flag_index] + docker_run_args[flag_index + 2:]
+        result = _docker_cmd(*docker_run_args, check=False)
+        stderr = (result.stderr or result.stdout or "").strip()
     if result.returncode != 0 and "is already in use" in stderr:
-        _docker_cmd("rm", "-f", container_name, check=False)
+        _docker_cmd("rm", "-f", container_name, check=False, capture=False)
         result = _docker_cmd(*docker_run_args, check=False)
     if result.returncode != 0:
         _delete_runtime_info(project_id)
@@ -1668,6 +2012,8 @@ def _launch_project_sandbox(project_id: uuid.UUID, *, sandbox_mode: str = "norma
 
     runtime_info["container_id"] = result.stdout.strip()
     _write_runtime_info(project_id, runtime_info)
+    # Prune only once the new record names its deps volume, so the volume just mounted is never a candidate.
+    threading.Thread(target=_prune_sandbox_deps_volumes, name="sandbox-deps-prune", daemon=True).start()
 
 
 def _deploy_project_to_sandbox(project_id: uuid.UUID, session: Session, *, raw: bool = False) -> SandboxStatus:
@@ -1806,8 +2152,7 @@ def proxy_sandbox_request_by_thread(
         request_kwargs["json"] = payload.json_body
 
     try:
-        with httpx.Client() as client:
-            response = client.request(**request_kwargs)
+        response = _SANDBOX_HTTP_CLIENT.request(**request_kwargs)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail="Failed to proxy the sandbox request.") from exc
 
@@ -69,6 +69,11 @@ class Settings(BaseSettings):
     MODEL_IMPLEMENTER: str = "arcee-ai/trinity-large-preview:free"
     MODEL_REVIEWER: str = "arcee-ai/trinity-large-preview:free"
 
+    # Opt-in only: runs generated code on the backend host when Docker is missing (tests / local dev).
+    SANDBOX_IN_PROCESS_SMOKE: bool = False
+    # Pull and bake the sandbox base image in the background on startup; test runs switch this off.
+    SANDBOX_PREWARM_IMAGE: bool = True
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
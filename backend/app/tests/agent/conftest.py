@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def mock_llm_completion():
+    """Patch the OpenAI client behind LLMClient; call the yielded helper with the reply content(s) in order."""
+    create = AsyncMock()
+    # Plain namespaces mirror the response shape without MagicMock's attribute recording.
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def respond_with(*contents: str) -> AsyncMock:
+        create.side_effect = [
+            SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+            for content in contents
+        ]
+        return create
+
+    with patch("app.agent.llm_client.AsyncOpenAI", return_value=client), patch(
+        "app.agent.llm_client.settings.LLM_API_KEY", "dummy_key"
+    ):
+        yield respond_with
@@ -35,6 +35,8 @@ class CodeValidatorTests(unittest.TestCase):
 
         self.assertFalse(report.passed)
         messages = [failure.message for failure in report.failures]
+        message_text = "\n".join(messages)
+        patch_paths = {request.path for request in report.patch_requests}
         self.assertTrue(
             any(
                 "unsupported keyword(s):" in message
@@ -43,8 +45,8 @@ class CodeValidatorTests(unittest.TestCase):
                 for message in messages
             )
         )
-        self.assertTrue(any("missing symbol `app.service.update_todo`" in message for message in messages))
-        self.assertTrue(any(request.path == "app/routes.py" for request in report.patch_requests))
+        self.assertIn("missing symbol `app.service.update_todo`", message_text)
+        self.assertIn("app/routes.py", patch_paths)
 
     def test_validator_catches_sqlmodel_field_runtime_traps(self):
         code = GeneratedCode(
@@ -67,12 +69,13 @@ class CodeValidatorTests(unittest.TestCase):
         report = validate_generated_backend(code)
 
         self.assertFalse(report.passed)
-        messages = [failure.message for failure in report.failures]
-        self.assertTrue(any("unsupported keyword `pattern`" in message for message in messages))
-        self.assertTrue(any("both `primary_key` and `sa_column`" in message for message in messages))
-        self.assertTrue(any("both `index` and `sa_column`" in message for message in messages))
-        self.assertTrue(any("both `foreign_key` and `sa_column`" in message for message in messages))
-        self.assertTrue(any(request.path == "app/models.py" for request in report.patch_requests))
+        message_text = "\n".join(failure.message for failure in report.failures)
+        patch_paths = {request.path for request in report.patch_requests}
+        self.assertIn("unsupported keyword `pattern`", message_text)
+        self.assertIn("both `primary_key` and `sa_column`", message_text)
+        self.assertIn("both `index` and `sa_column`", message_text)
+        self.assertIn("both `foreign_key` and `sa_column`", message_text)
+        self.assertIn("app/models.py", patch_paths)
 
     def test_validator_requires_email_validator_for_emailstr(self):
         code = GeneratedCode(
@@ -93,9 +96,10 @@ class CodeValidatorTests(unittest.TestCase):
         report = validate_generated_backend(code)
 
         self.assertFalse(report.passed)
-        messages = [failure.message for failure in report.failures]
-        self.assertTrue(any("uses `EmailStr`" in message for message in messages))
-        self.assertTrue(any(request.path == "app/schemas.py" for request in report.patch_requests))
+        message_text = "\n".join(failure.message for failure in report.failures)
+        patch_paths = {request.path for request in report.patch_requests}
+        self.assertIn("uses `EmailStr`", message_text)
+        self.assertIn("app/schemas.py", patch_paths)
 
     def test_validator_catches_missing_module_attribute_reference(self):
         code = GeneratedCode(
@@ -122,9 +126,10 @@ class CodeValidatorTests(unittest.TestCase):
         report = validate_generated_backend(code)
 
         self.assertFalse(report.passed)
-        messages = [failure.message for failure in report.failures]
-        self.assertTrue(any("missing symbol `app.schemas.TokenResponse`" in message for message in messages))
-        self.assertTrue(any(request.path == "app/routes.py" for request in report.patch_requests))
+        message_text = "\n".join(failure.message for failure in report.failures)
+        patch_paths = {request.path for request in report.patch_requests}
+        self.assertIn("missing symbol `app.schemas.TokenResponse`", message_text)
+        self.assertIn("app/routes.py", patch_paths)
 
     def test_validator_catches_duplicate_router_prefixes_and_scalar_one(self):
         code = GeneratedCode(
@@ -154,11 +159,12 @@ class CodeValidatorTests(unittest.TestCase):
         report = validate_generated_backend(code)
 
         self.assertFalse(report.passed)
-        messages = [failure.message for failure in report.failures]
-        self.assertTrue(any("Router prefix is duplicated" in message for message in messages))
-        self.assertTrue(any("scalar_one()" in message for message in messages))
-        self.assertTrue(any(request.path == "app/main.py" for request in report.patch_requests))
-        self.assertTrue(any(request.path == "app/routes.py" for request in report.patch_requests))
+        message_text = "\n".join(failure.message for failure in report.failures)
+        patch_paths = {request.path for request in report.patch_requests}
+        self.assertIn("Router prefix is duplicated", message_text)
+        self.assertIn("scalar_one()", message_text)
+        self.assertIn("app/main.py", patch_paths)
+        self.assertIn("app/routes.py", patch_paths)
 
     def test_validator_catches_field_name_type_annotation_collision(self):
         code = GeneratedCode(
@@ -179,9 +185,10 @@ class CodeValidatorTests(unittest.TestCase):
         report = validate_generated_backend(code)
 
         self.assertFalse(report.passed)
-        messages = [failure.message for failure in report.failures]
-        self.assertTrue(any("clashes with its type annotation" in message for message in messages))
-        self.assertTrue(any(request.path == "app/models.py" for request in report.patch_requests))
+        message_text = "\n".join(failure.message for failure in report.failures)
+        patch_paths = {request.path for request in report.patch_requests}
+        self.assertIn("clashes with its type annotation", message_text)
+        self.assertIn("app/models.py", patch_paths)
 
     def test_validator_catches_duplicate_field_index_and_duplicate_create_all(self):
         code = GeneratedCode(
@@ -220,11 +227,12 @@ class CodeValidatorTests(unittest.TestCase):
         report = validate_generated_backend(code)
 
         self.assertFalse(report.passed)
-        messages = [failure.message for failure in report.failures]
-        self.assertTrue(any("Field `email` declares `index=True`" in message for message in messages))
-        self.assertTrue(any("Schema initialization runs in both `app.database` and `app.main`" in message for message in messages))
-        self.assertTrue(any(request.path == "app/main.py" for request in report.patch_requests))
-        self.assertTrue(any(request.path == "app/models.py" for request in report.patch_requests))
+        message_text = "\n".join(failure.message for failure in report.failures)
+        patch_paths = {request.path for request in report.patch_requests}
+        self.assertIn("Field `email` declares `index=True`", message_text)
+        self.assertIn("Schema initialization runs in both `app.database` and `app.main`", message_text)
+        self.assertIn("app/main.py", patch_paths)
+        self.assertIn("app/models.py", patch_paths)
 
 
 if __name__ == "__main__":
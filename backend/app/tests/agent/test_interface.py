@@ -1,34 +1,28 @@
-from app.agent.interface import InterfaceAgent, InterfaceContextMessage
-
-
-def test_looks_like_thread_code_question_requires_prior_context():
-    assert not InterfaceAgent.looks_like_thread_code_question(
-        "Where is auth handled?",
-        recent_messages=[],
-    )
+import pytest
 
+from app.agent.interface import InterfaceAgent, InterfaceContextMessage
 
-def test_looks_like_thread_code_question_detects_explanation_requests():
-    recent_messages = [
-        InterfaceContextMessage(role="agent", content="Interius generated a backend scaffold."),
-    ]
-
+AGENT_CONTEXT = [
+    InterfaceContextMessage(role="agent", content="Interius generated a backend scaffold."),
+]
+ASSISTANT_CONTEXT = [
+    InterfaceContextMessage(role="assistant", content="Interius completed the build."),
+]
+
+THREAD_CODE_QUESTION_CASES = [
+    # Requires prior context
+    ("Where is auth handled?", [], False),
+    # Detects explanation requests
+    ("Where is auth handled in the generated code?", AGENT_CONTEXT, True),
+    ("Explain the users route file", AGENT_CONTEXT, True),
+    # Ignores change requests
+    ("Update the auth route to use JWT", ASSISTANT_CONTEXT, False),
+]
+
+
+@pytest.mark.parametrize("message,recent_messages,expected", THREAD_CODE_QUESTION_CASES)
+def test_looks_like_thread_code_question(message, recent_messages, expected):
     assert InterfaceAgent.looks_like_thread_code_question(
-        "Where is auth handled in the generated code?",
-        recent_messages=recent_messages,
-    )
-    assert InterfaceAgent.looks_like_thread_code_question(
-        "Explain the users route file",
-        recent_messages=recent_messages,
-    )
-
-
-def test_looks_like_thread_code_question_ignores_change_requests():
-    recent_messages = [
-        InterfaceContextMessage(role="assistant", content="Interius completed the build."),
-    ]
-
-    assert not InterfaceAgent.looks_like_thread_code_question(
-        "Update the auth route to use JWT",
+        message,
         recent_messages=recent_messages,
-    )
+    ) is expected
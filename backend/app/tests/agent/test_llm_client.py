@@ -1,10 +1,17 @@
-import sys
-from unittest.mock import AsyncMock, patch, MagicMock
-
 import pytest
 from pydantic import BaseModel
 
-from app.agent.llm_client import LLMClient
+from app.agent.llm_client import LLMClient, _structured_text_candidates
+
+ALICE_JSON = '{"name": "Alice", "age": 30}'
+
+STRUCTURED_REPLY_CASES = [
+    pytest.param([ALICE_JSON], 1, id="plain"),
+    pytest.param([f"```json\n{ALICE_JSON}\n```"], 1, id="markdown"),
+    pytest.param([f"Here you go: {ALICE_JSON} Hope that helps!"], 1, id="prose"),
+    pytest.param([f"json: {ALICE_JSON}"], 1, id="json-prefix"),
+    pytest.param(['{"name": "Alice"', ALICE_JSON], 2, id="invalid-then-retry"),
+]
 
 
 class DummyModel(BaseModel):
@@ -12,40 +19,25 @@ class DummyModel(BaseModel):
     age: int
 
 
-@pytest.mark.asyncio
-async def test_llm_client_json_parsing():
-    
-    # Mock response object mapping the OpenAI API response structure
-    mock_message = MagicMock()
-    mock_message.content = '{"name": "Alice", "age": 30}'
-    
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    
-    mock_response = MagicMock()
-    mock_response.choices = [mock_choice]
-    
-    # Mock the AsyncOpenAI client
-    mock_completions = MagicMock()
-    mock_completions.create = AsyncMock(return_value=mock_response)
-    
-    mock_chat = MagicMock()
-    mock_chat.completions = mock_completions
-    
-    mock_client_instance = AsyncMock()
-    mock_client_instance.chat = mock_chat
-    
-    with patch("app.agent.llm_client.AsyncOpenAI", return_value=mock_client_instance):
-        with patch("app.agent.llm_client.settings.LLM_API_KEY", "dummy_key"):
-            client = LLMClient(model_name="test-model")
-            
-            result = await client.generate_structured(
-                system_prompt="You are a helpful assistant.",
-                user_prompt="Give me Alice's details",
-                response_schema=DummyModel
-            )
-            
-            assert isinstance(result, DummyModel)
-            assert result.name == "Alice"
-            assert result.age == 30
-            mock_completions.create.assert_called_once()
+@pytest.mark.parametrize("replies,expected_calls", STRUCTURED_REPLY_CASES)
+async def test_llm_client_json_parsing(mock_llm_completion, replies, expected_calls):
+    create = mock_llm_completion(*replies)
+
+    client = LLMClient(model_name="test-model")
+
+    result = await client.generate_structured(
+        system_prompt="You are a helpful assistant.",
+        user_prompt="Give me Alice's details",
+        response_schema=DummyModel
+    )
+
+    assert isinstance(result, DummyModel)
+    assert result.name == "Alice"
+    assert result.age == 30
+    assert create.call_count == expected_calls
+
+
+def test_structured_text_candidates_extract_json_span_from_prose():
+    candidates = _structured_text_candidates('Here you go: {"name": "Bob }", "tags": ["a"]} Hope that helps!')
+
+    assert '{"name": "Bob }", "tags": ["a"]}' in candidates
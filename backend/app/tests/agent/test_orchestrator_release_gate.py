@@ -1,7 +1,7 @@
 import json
 import uuid
 import unittest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
 
 from app.agent.artifacts import (
     CodeFile,
@@ -66,19 +66,22 @@ class OrchestratorReleaseGateTests(unittest.IsolatedAsyncioTestCase):
             summary="Generated API is deployable. Some endpoint smoke checks still reported warnings, but artifacts are being returned.",
         )
 
-        with patch("app.agent.orchestrator.RequirementsAgent") as req_cls, \
-             patch("app.agent.orchestrator.ArchitectureAgent") as arch_cls, \
-             patch("app.agent.orchestrator.ImplementerAgent") as imp_cls, \
-             patch("app.agent.orchestrator.ReviewerAgent") as rev_cls, \
-             patch("app.agent.orchestrator.RepairAgent") as repair_cls, \
-             patch("app.agent.orchestrator.create_artifact_record"), \
-             patch("app.agent.orchestrator.store_code_bundle", return_value="bundle-ref"), \
-             patch("app.agent.orchestrator._update_run_status_safely"):
-            req_cls.return_value.run = AsyncMock(return_value=charter)
-            arch_cls.return_value.run = AsyncMock(return_value=architecture)
-            imp_cls.return_value.run = AsyncMock(return_value=code)
-            rev_cls.return_value.run = AsyncMock(return_value=review)
-            repair_cls.return_value.run = AsyncMock(return_value=repair)
+        with patch.multiple(
+            "app.agent.orchestrator",
+            RequirementsAgent=DEFAULT,
+            ArchitectureAgent=DEFAULT,
+            ImplementerAgent=DEFAULT,
+            ReviewerAgent=DEFAULT,
+            RepairAgent=DEFAULT,
+            create_artifact_record=DEFAULT,
+            store_code_bundle=MagicMock(return_value="bundle-ref"),
+            _update_run_status_safely=DEFAULT,
+        ) as mocks:
+            mocks["RequirementsAgent"].return_value.run = AsyncMock(return_value=charter)
+            mocks["ArchitectureAgent"].return_value.run = AsyncMock(return_value=architecture)
+            mocks["ImplementerAgent"].return_value.run = AsyncMock(return_value=code)
+            mocks["ReviewerAgent"].return_value.run = AsyncMock(return_value=review)
+            mocks["RepairAgent"].return_value.run = AsyncMock(return_value=repair)
 
             events = []
             async for event in run_pipeline_generator(
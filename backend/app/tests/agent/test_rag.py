@@ -1,30 +1,23 @@
-import shutil
-import tempfile
+from contextlib import ExitStack
 from unittest.mock import patch, MagicMock
 import pytest
 
 from app.agent.rag import RAGManager, chunk_code_text, format_thread_generated_file_context
+from app.text_chunking import chunk_text
 
 
 @pytest.fixture
-def temp_chroma():
-    # Setup temporary directory for ChromDB
-    temp_dir = tempfile.mkdtemp()
-    
-    # Mock PersistentClient entirely to avoid ChromaDB startup / telemetry freezes
-    with patch("app.agent.rag.chromadb.PersistentClient") as mock_chroma_client:
+def temp_chroma(tmp_path):
+    with ExitStack() as stack:
+        # Mock PersistentClient entirely to avoid ChromaDB startup / telemetry freezes
+        mock_chroma_client = stack.enter_context(patch("app.agent.rag.chromadb.PersistentClient"))
         mock_collection = MagicMock()
         mock_chroma_client.return_value.get_or_create_collection.return_value = mock_collection
-        
         # Mock settings so we don't try to use the real Gemini embedding unless we have key
-        with patch("app.agent.rag.settings.GEMINI_API_KEY", ""):
-            # Mock default embedding to avoid ONNX download
-            with patch("app.agent.rag.embedding_functions.DefaultEmbeddingFunction"):
-                manager = RAGManager(persist_directory=temp_dir)
-                yield manager, mock_collection
-        
-    # Teardown
-    shutil.rmtree(temp_dir)
+        stack.enter_context(patch("app.agent.rag.settings.GEMINI_API_KEY", ""))
+        # Mock default embedding to avoid ONNX download
+        stack.enter_context(patch("app.agent.rag.embedding_functions.DefaultEmbeddingFunction"))
+        yield RAGManager(persist_directory=str(tmp_path)), mock_collection
 
 
 def test_rag_manager_add_and_query(temp_chroma):
@@ -60,7 +53,6 @@ def test_rag_manager_add_and_query(temp_chroma):
     assert empty_context == ""
 
 def test_chunking_logic():
-    from app.text_chunking import chunk_text
     text = "A" * 3000
     chunks = chunk_text(text, chunk_size=2000, overlap=100)
     assert len(chunks) == 2
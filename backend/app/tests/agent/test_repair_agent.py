@@ -13,28 +13,26 @@ from app.agent.artifacts import (
 )
 from app.agent.repair_agent import RepairAgent
 
+# RepairAgent only reads these artifacts, so every test shares one validated instance.
+ARCHITECTURE = SystemArchitecture(
+    design_document="Simple CRUD API",
+    mermaid_diagram="flowchart TD\nA[Client]-->B[API]",
+    components=["API", "Persistence"],
+    data_model_summary=["Todo(id, title)"],
+    endpoint_summary=["GET /todos", "POST /todos"],
+)
+REVIEW_REPORT = ReviewReport(
+    issues=[],
+    suggestions=[],
+    security_score=8,
+    approved=True,
+    affected_files=[],
+    patch_requests=[],
+    final_code=[],
+)
 
-class RepairAgentTests(unittest.IsolatedAsyncioTestCase):
-    def _architecture(self) -> SystemArchitecture:
-        return SystemArchitecture(
-            design_document="Simple CRUD API",
-            mermaid_diagram="flowchart TD\nA[Client]-->B[API]",
-            components=["API", "Persistence"],
-            data_model_summary=["Todo(id, title)"],
-            endpoint_summary=["GET /todos", "POST /todos"],
-        )
-
-    def _review_report(self) -> ReviewReport:
-        return ReviewReport(
-            issues=[],
-            suggestions=[],
-            security_score=8,
-            approved=True,
-            affected_files=[],
-            patch_requests=[],
-            final_code=[],
-        )
 
+class RepairAgentTests(unittest.IsolatedAsyncioTestCase):
     async def test_repair_agent_returns_without_changes_when_runtime_checks_pass(self):
         code = GeneratedCode(
             files=[CodeFile(path="app/main.py", content="from fastapi import FastAPI\napp = FastAPI()\n")],
@@ -56,9 +54,9 @@ class RepairAgentTests(unittest.IsolatedAsyncioTestCase):
 
         report = await agent.run(
             RepairContext(
-                architecture=self._architecture(),
+                architecture=ARCHITECTURE,
                 code=code,
-                review_report=self._review_report(),
+                review_report=REVIEW_REPORT,
                 project_id="123e4567-e89b-12d3-a456-426614174000",
             )
         )
@@ -129,9 +127,9 @@ class RepairAgentTests(unittest.IsolatedAsyncioTestCase):
 
             report = await agent.run(
                 RepairContext(
-                    architecture=self._architecture(),
+                    architecture=ARCHITECTURE,
                     code=original_code,
-                    review_report=self._review_report(),
+                    review_report=REVIEW_REPORT,
                 )
             )
 
@@ -222,9 +220,9 @@ class RepairAgentTests(unittest.IsolatedAsyncioTestCase):
 
             report = await agent.run(
                 RepairContext(
-                    architecture=self._architecture(),
+                    architecture=ARCHITECTURE,
                     code=original_code,
-                    review_report=self._review_report(),
+                    review_report=REVIEW_REPORT,
                     project_id="123e4567-e89b-12d3-a456-426614174000",
                 )
             )
@@ -265,9 +263,9 @@ class RepairAgentTests(unittest.IsolatedAsyncioTestCase):
 
             report = await agent.run(
                 RepairContext(
-                    architecture=self._architecture(),
+                    architecture=ARCHITECTURE,
                     code=original_code,
-                    review_report=self._review_report(),
+                    review_report=REVIEW_REPORT,
                     project_id="123e4567-e89b-12d3-a456-426614174000",
                 )
             )
@@ -306,9 +304,9 @@ class RepairAgentTests(unittest.IsolatedAsyncioTestCase):
 
         report = await agent.run(
             RepairContext(
-                architecture=self._architecture(),
+                architecture=ARCHITECTURE,
                 code=code,
-                review_report=self._review_report(),
+                review_report=REVIEW_REPORT,
                 project_id="123e4567-e89b-12d3-a456-426614174000",
             )
         )
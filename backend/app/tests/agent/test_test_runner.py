@@ -0,0 +1,79 @@
+import uuid
+from unittest.mock import AsyncMock, patch
+
+from app.agent.artifacts import CodeFile, GeneratedCode
+from app.agent.test_runner import TestRunner
+
+
+def _in_process_opt_in():
+    return patch("app.agent.test_runner.settings.SANDBOX_IN_PROCESS_SMOKE", True)
+
+
+def _generated_app(route_body: str) -> GeneratedCode:
+    return GeneratedCode(
+        files=[
+            CodeFile(path="app/__init__.py", content=""),
+            CodeFile(
+                path="app/main.py",
+                content=(
+                    "from fastapi import FastAPI\n\n"
+                    "app = FastAPI()\n\n"
+                    "@app.get('/health')\n"
+                    "def health():\n"
+                    f"    {route_body}\n"
+                ),
+            ),
+        ],
+        dependencies=["fastapi"],
+    )
+
+
+async def test_runner_smokes_generated_app_in_process_without_docker():
+    runner = TestRunner()
+    with _in_process_opt_in(), patch("app.api.routes.sandbox._docker_available", return_value=False), patch.object(
+        runner, "_live_sandbox_check", new_callable=AsyncMock
+    ) as live_check:
+        report = await runner.run(_generated_app("return {'status': 'ok'}"), project_id=str(uuid.uuid4()))
+
+    live_check.assert_not_called()
+    assert report.checks_run == ["syntax", "import_smoke", "endpoint_smoke"]
+    assert report.passed
+    assert report.failures == []
+
+
+async def test_runner_reports_in_process_endpoint_failures_against_generated_file():
+    runner = TestRunner()
+    with _in_process_opt_in(), patch("app.api.routes.sandbox._docker_available", return_value=False):
+        report = await runner.run(_generated_app("raise RuntimeError('boom')"), project_id=str(uuid.uuid4()))
+
+    assert report.failures
+    assert report.failures[0].check == "endpoint_smoke"
+    assert report.failures[0].file_path == "app/main.py"
+
+
+async def test_runner_does_not_run_generated_code_in_process_without_opt_in():
+    runner = TestRunner()
+    with patch("app.api.routes.sandbox._docker_available", return_value=False), patch.object(
+        runner, "_in_process_smoke_check", new_callable=AsyncMock
+    ) as in_process, patch.object(
+        runner, "_live_sandbox_check", new_callable=AsyncMock, return_value=([], [])
+    ) as live_check:
+        await runner.run(_generated_app("return {'status': 'ok'}"), project_id=str(uuid.uuid4()))
+
+    in_process.assert_not_called()
+    live_check.assert_awaited_once()
+
+
+async def test_runner_in_process_smoke_hides_backend_secrets(monkeypatch):
+    monkeypatch.setenv("LLM_API_KEY", "backend-secret")
+    monkeypatch.setenv("POSTGRES_PASSWORD", "backend-secret")
+    runner = TestRunner()
+    with _in_process_opt_in(), patch("app.api.routes.sandbox._docker_available", return_value=False):
+        report = await runner.run(
+            _generated_app(
+                "import os; assert not {'LLM_API_KEY', 'POSTGRES_PASSWORD'} & set(os.environ); return {'status': 'ok'}"
+            ),
+            project_id=str(uuid.uuid4()),
+        )
+
+    assert report.failures == []
@@ -1,13 +1,30 @@
+import os
+import shutil
+import subprocess
+import threading
 import unittest
+import uuid
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
 
 from app.api.routes.sandbox import (
-    _dedupe_router_prefixes,
-    _dedupe_sandbox_schema_bootstrap,
+    _SANDBOX_PORT_LOCK,
+    SANDBOX_PORT_RANGE_START,
+    _allocate_sandbox_port,
+    _begin_previous_sandbox_teardown,
+    _docker_container_health,
+    _docker_daemon_reachable,
+    _launch_project_sandbox,
+    _logs_look_like_failure,
     _normalize_sandbox_source,
     _openapi_looks_like_fallback,
+    _prune_sandbox_deps_volumes,
+    _read_runtime_info,
     _remove_duplicate_field_indexes,
+    _wait_for_sandbox,
+    _write_runtime_info,
+    _write_sandbox_bundle,
 )
 
 
@@ -76,52 +93,64 @@ class SandboxNormalizerTests(unittest.TestCase):
         self.assertNotIn("index=True", normalized)
 
     def test_normalizer_dedupes_main_startup_create_all_when_database_bootstraps(self):
-        with TemporaryDirectory() as tmpdir:
-            sandbox_dir = Path(tmpdir)
-            app_dir = sandbox_dir / "app"
-            app_dir.mkdir(parents=True, exist_ok=True)
-            (app_dir / "database.py").write_text(
-                "from sqlmodel import SQLModel\n"
-                "def init_db(engine):\n"
-                "    SQLModel.metadata.create_all(engine)\n",
-                encoding="utf-8",
-            )
-            (app_dir / "main.py").write_text(
-                "from sqlmodel import SQLModel\n"
-                "from app.database import engine\n\n"
-                "def on_startup():\n"
-                "    SQLModel.metadata.create_all(engine)\n",
-                encoding="utf-8",
+        project_id = uuid.uuid4()
+        with TemporaryDirectory() as tmpdir, patch("app.api.routes.sandbox.SANDBOX_HOST_ROOT", Path(tmpdir)):
+            _write_sandbox_bundle(
+                project_id,
+                [
+                    {
+                        "path": "app/database.py",
+                        "content": (
+                            "from sqlmodel import SQLModel\n"
+                            "def init_db(engine):\n"
+                            "    SQLModel.metadata.create_all(engine)\n"
+                        ),
+                    },
+                    {
+                        "path": "app/main.py",
+                        "content": (
+                            "from sqlmodel import SQLModel\n"
+                            "from app.database import engine\n\n"
+                            "def on_startup():\n"
+                            "    SQLModel.metadata.create_all(engine)\n"
+                        ),
+                    },
+                ],
+                [],
             )
 
-            _dedupe_sandbox_schema_bootstrap(sandbox_dir)
-
-            main_source = (app_dir / "main.py").read_text(encoding="utf-8")
+            main_source = (Path(tmpdir) / str(project_id) / "app" / "main.py").read_text(encoding="utf-8")
             self.assertNotIn("SQLModel.metadata.create_all(engine)", main_source)
 
     def test_normalizer_dedupes_include_router_prefix_when_router_declares_same_prefix(self):
-        with TemporaryDirectory() as tmpdir:
-            sandbox_dir = Path(tmpdir)
-            app_dir = sandbox_dir / "app"
-            app_dir.mkdir(parents=True, exist_ok=True)
-            (app_dir / "routes.py").write_text(
-                'from fastapi import APIRouter\n'
-                'auth_router = APIRouter(prefix="/auth")\n'
-                'expenses_router = APIRouter(prefix="/expenses")\n',
-                encoding="utf-8",
+        project_id = uuid.uuid4()
+        with TemporaryDirectory() as tmpdir, patch("app.api.routes.sandbox.SANDBOX_HOST_ROOT", Path(tmpdir)):
+            _write_sandbox_bundle(
+                project_id,
+                [
+                    {
+                        "path": "app/routes.py",
+                        "content": (
+                            'from fastapi import APIRouter\n'
+                            'auth_router = APIRouter(prefix="/auth")\n'
+                            'expenses_router = APIRouter(prefix="/expenses")\n'
+                        ),
+                    },
+                    {
+                        "path": "app/main.py",
+                        "content": (
+                            'from fastapi import FastAPI\n'
+                            'from app.routes import auth_router, expenses_router\n'
+                            'app = FastAPI()\n'
+                            'app.include_router(auth_router, prefix="/auth", tags=["auth"])\n'
+                            'app.include_router(expenses_router, prefix="/expenses", tags=["expenses"])\n'
+                        ),
+                    },
+                ],
+                [],
             )
-            (app_dir / "main.py").write_text(
-                'from fastapi import FastAPI\n'
-                'from app.routes import auth_router, expenses_router\n'
-                'app = FastAPI()\n'
-                'app.include_router(auth_router, prefix="/auth", tags=["auth"])\n'
-                'app.include_router(expenses_router, prefix="/expenses", tags=["expenses"])\n',
-                encoding="utf-8",
-            )
-
-            _dedupe_router_prefixes(sandbox_dir)
 
-            main_source = (app_dir / "main.py").read_text(encoding="utf-8")
+            main_source = (Path(tmpdir) / str(project_id) / "app" / "main.py").read_text(encoding="utf-8")
             self.assertIn('app.include_router(auth_router, tags=["auth"])', main_source)
             self.assertIn('app.include_router(expenses_router, tags=["expenses"])', main_source)
             self.assertNotIn('prefix="/auth"', main_source)
@@ -161,9 +190,164 @@ class SandboxNormalizerTests(unittest.TestCase):
         self.assertNotIn("foreign_key='user.id'", normalized)
 
     def test_fallback_openapi_detection_flags_shell_apps(self):
-        self.assertTrue(_openapi_looks_like_fallback({"paths": {"/": {"get": {}}}}))
-        self.assertTrue(_openapi_looks_like_fallback({"paths": {"/health": {"get": {}}, "/ready": {"get": {}}}}))
-        self.assertFalse(_openapi_looks_like_fallback({"paths": {"/notes": {"get": {}}, "/auth/login": {"post": {}}}}))
+        cases = [
+            ({"/": {"get": {}}}, True),
+            ({"/health": {"get": {}}, "/ready": {"get": {}}}, True),
+            ({"/notes": {"get": {}}, "/auth/login": {"post": {}}}, False),
+        ]
+        for paths, expected in cases:
+            with self.subTest(paths=sorted(paths)):
+                self.assertEqual(_openapi_looks_like_fallback({"paths": paths}), expected)
+
+    def test_failure_log_detection_matches_markers_case_insensitively(self):
+        cases = [
+            ("Traceback (most recent call last):", True),
+            ("ModuleNotFoundError: No module named 'jose'", True),
+            ("INFO:     Application startup complete.", False),
+            (None, False),
+        ]
+        for logs, expected in cases:
+            with self.subTest(logs=logs):
+                self.assertEqual(_logs_look_like_failure(logs), expected)
+
+    def test_container_health_reports_exited_containers(self):
+        def inspect(stdout):
+            return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr="")
+
+        with patch("app.api.routes.sandbox._docker_cmd", return_value=inspect("true healthy\n")):
+            self.assertEqual(_docker_container_health("sandbox"), "healthy")
+        with patch("app.api.routes.sandbox._docker_cmd", return_value=inspect("true \n")):
+            self.assertIsNone(_docker_container_health("sandbox"))
+        with patch("app.api.routes.sandbox._docker_cmd", return_value=inspect("false unhealthy\n")):
+            self.assertEqual(_docker_container_health("sandbox"), "exited")
+
+    def test_wait_for_sandbox_polls_after_inconclusive_event_stream(self):
+        project_id = uuid.uuid4()
+        runtime_info = {"container_name": "prosit2-sandbox-new", "port": 9100, "started_at": 1}
+        with patch("app.api.routes.sandbox._read_runtime_info", return_value=runtime_info), patch(
+            "app.api.routes.sandbox._await_sandbox_health_event", return_value=None
+        ) as await_event, patch("app.api.routes.sandbox._docker_container_health", return_value="healthy"):
+            self.assertTrue(_wait_for_sandbox(project_id, timeout_seconds=20))
+
+        self.assertLess(await_event.call_args.kwargs["timeout_seconds"], 20)
+
+    def test_docker_daemon_probe_fails_fast_without_socket(self):
+        with TemporaryDirectory() as tmpdir:
+            missing_socket = Path(tmpdir) / "docker.sock"
+            with patch.dict(os.environ, {"DOCKER_HOST": f"unix://{missing_socket}"}):
+                self.assertFalse(_docker_daemon_reachable())
+        with patch.dict(os.environ, {"DOCKER_HOST": "tcp://127.0.0.1:2375"}):
+            self.assertTrue(_docker_daemon_reachable())
+
+    def test_previous_container_teardown_removes_recorded_container(self):
+        project_id = uuid.uuid4()
+        with TemporaryDirectory() as tmpdir, patch("app.api.routes.sandbox.SANDBOX_HOST_ROOT", Path(tmpdir)):
+            (Path(tmpdir) / str(project_id)).mkdir()
+            _write_runtime_info(project_id, {"container_name": "prosit2-sandbox-old"})
+            with patch("app.api.routes.sandbox._docker_cmd") as docker_cmd:
+                teardown = _begin_previous_sandbox_teardown(project_id)
+                self.assertIsNotNone(teardown)
+                teardown.join()
+
+        docker_cmd.assert_called_once_with("rm", "-f", "prosit2-sandbox-old", check=False, capture=False)
+
+    def test_previous_container_port_stays_reserved_until_teardown_finishes(self):
+        project_id = uuid.uuid4()
+        removal_started = threading.Event()
+        release_removal = threading.Event()
+
+        def slow_rm(*args, **kwargs):
+            self.assertEqual(args, ("rm", "-f", "prosit2-sandbox-old"))
+            self.assertEqual(kwargs, {"check": False, "capture": False})
+            removal_started.set()
+            release_removal.wait(timeout=5)
+
+        with TemporaryDirectory() as tmpdir, patch("app.api.routes.sandbox.SANDBOX_HOST_ROOT", Path(tmpdir)), patch(
+            "app.api.routes.sandbox._is_host_port_available", return_value=True
+        ):
+            (Path(tmpdir) / str(project_id)).mkdir()
+            _write_runtime_info(
+                project_id, {"container_name": "prosit2-sandbox-old", "port": SANDBOX_PORT_RANGE_START}
+            )
+            with patch("app.api.routes.sandbox._docker_cmd", side_effect=slow_rm):
+                teardown = _begin_previous_sandbox_teardown(project_id)
+                removal_started.wait(timeout=5)
+                shutil.rmtree(Path(tmpdir) / str(project_id))
+                with _SANDBOX_PORT_LOCK:
+                    self.assertNotEqual(_allocate_sandbox_port(project_id), SANDBOX_PORT_RANGE_START)
+                release_removal.set()
+                teardown.join()
+
+            with _SANDBOX_PORT_LOCK:
+                self.assertEqual(_allocate_sandbox_port(project_id), SANDBOX_PORT_RANGE_START)
+
+    def test_deps_volume_prune_keeps_newest_and_recorded_volumes(self):
+        volumes = {f"prosit-sandbox-deps-{index}": f"2026-01-{index + 1:02d}T00:00:00Z" for index in range(5)}
+
+        def docker(*args, **kwargs):
+            self.assertFalse(kwargs["check"])
+            if args[:2] == ("volume", "ls"):
+                stdout = "\n".join(volumes)
+            elif args[:2] == ("volume", "inspect"):
+                stdout = "\n".join(f"{volumes[name]} {name}" for name in args[4:])
+            else:
+                stdout = ""
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout=stdout, stderr="")
+
+        with patch("app.api.routes.sandbox.SANDBOX_DEPS_VOLUME_KEEP", 2), patch(
+            "app.api.routes.sandbox._read_all_runtime_infos", return_value=[{"deps_volume": "prosit-sandbox-deps-0"}]
+        ), patch("app.api.routes.sandbox._docker_cmd", side_effect=docker) as docker_cmd:
+            _prune_sandbox_deps_volumes()
+
+        removed = [call.args[2] for call in docker_cmd.call_args_list if call.args[:2] == ("volume", "rm")]
+        self.assertEqual(sorted(removed), ["prosit-sandbox-deps-1", "prosit-sandbox-deps-2"])
+
+    def test_launch_prunes_deps_volumes_after_recording_the_mounted_volume(self):
+        project_id = uuid.uuid4()
+        run_args = []
+        prune_threads = []
+
+        def docker(*args, **kwargs):
+            self.assertFalse(kwargs["check"])
+            run_args.extend(args)
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout="container-id\n", stderr="")
+
+        def thread(target, **kwargs):
+            self.assertTrue(kwargs["daemon"])
+            prune_threads.append((target, _read_runtime_info(project_id)))
+            return MagicMock()
+
+        with TemporaryDirectory() as tmpdir, patch("app.api.routes.sandbox.SANDBOX_HOST_ROOT", Path(tmpdir)), patch(
+            "app.api.routes.sandbox._is_host_port_available", return_value=True
+        ), patch("app.api.routes.sandbox._docker_cmd", side_effect=docker), patch(
+            "app.api.routes.sandbox.threading.Thread", side_effect=thread
+        ):
+            _write_sandbox_bundle(project_id, [{"path": "app/main.py", "content": "app = None\n"}], [])
+            _launch_project_sandbox(project_id)
+
+        self.assertEqual(run_args[0], "run")
+        [(target, runtime_info)] = prune_threads
+        self.assertIs(target, _prune_sandbox_deps_volumes)
+        self.assertEqual(runtime_info["container_id"], "container-id")
+        self.assertIn(f"{runtime_info['deps_volume']}:/opt/sandbox-deps", run_args)
+
+    def test_entrypoint_serializes_dependency_installs_on_shared_volume(self):
+        project_id = uuid.uuid4()
+        with TemporaryDirectory() as tmpdir, patch("app.api.routes.sandbox.SANDBOX_HOST_ROOT", Path(tmpdir)):
+            _write_sandbox_bundle(project_id, [{"path": "app/main.py", "content": "app = None\n"}], [])
+            entrypoint = (Path(tmpdir) / str(project_id) / "container_entrypoint.sh").read_text(encoding="utf-8")
+
+        self.assertIn('9>"/opt/sandbox-deps/.install.lock"', entrypoint)
+        self.assertLess(entrypoint.index("flock 9"), entrypoint.index("-m pip install"))
+
+    def test_entrypoint_starts_uvicorn_through_sandbox_venv_interpreter(self):
+        project_id = uuid.uuid4()
+        with TemporaryDirectory() as tmpdir, patch("app.api.routes.sandbox.SANDBOX_HOST_ROOT", Path(tmpdir)):
+            _write_sandbox_bundle(project_id, [{"path": "app/main.py", "content": "app = None\n"}], [])
+            entrypoint = (Path(tmpdir) / str(project_id) / "container_entrypoint.sh").read_text(encoding="utf-8")
+
+        self.assertIn('exec "/opt/sandbox-deps/bin/python" -m uvicorn "$MODULE"', entrypoint)
+        self.assertNotIn("exec uvicorn", entrypoint)
 
     def test_normalizer_exports_api_router_when_generated_routes_only_expose_router_list(self):
         source = (
@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+
+set -e
+set -x
+
+# Agent and sandbox unit tests use only tmp dirs and mocks, so spread them across one worker per file.
+python -m pytest -n auto --dist=loadfile app/tests "$@"
@@ -4,6 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
+from app.api.routes import generate as generate_routes
 from app.core.config import settings
 from app.core.db import engine, init_db
 from app.main import app
@@ -12,6 +13,14 @@ from tests.utils.user import authentication_token_from_email
 from tests.utils.utils import get_superuser_token_headers
 
 
+@pytest.fixture(scope="session", autouse=True)
+def no_sandbox_prewarm() -> Generator[None, None, None]:
+    # App startup would otherwise start a background docker pull/build for every test run.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "SANDBOX_PREWARM_IMAGE", False)
+        yield
+
+
 @pytest.fixture(scope="session", autouse=True)
 def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
@@ -22,12 +31,20 @@ def db() -> Generator[Session, None, None]:
         session.commit()
 
 
-@pytest.fixture(scope="module")
+# One app startup (lifespan, route registration, schema builds) serves the whole run.
+@pytest.fixture(scope="session")
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
         yield c
 
 
+@pytest.fixture(autouse=True)
+def reset_module_caches() -> Generator[None, None, None]:
+    # The app outlives each test, so per-process caches are cleared to keep tests independent.
+    yield
+    generate_routes._chat_bridge_user_id = None
+
+
 @pytest.fixture(scope="module")
 def superuser_token_headers(client: TestClient) -> dict[str, str]:
     return get_superuser_token_headers(client)
@@ -93,7 +93,7 @@ async function promptLogin(existingConfig) {
   }
 }
 
-async function backupFile(cwd, relativePath) {
+async function backupFile(cwd, relativePath, backupRoot) {
   const absolutePath = path.join(cwd, relativePath);
   try {
     await stat(absolutePath);
@@ -101,16 +101,14 @@ async function backupFile(cwd, relativePath) {
     return;
   }
 
-  const backupRoot = path.join(
-    getBackupRoot(cwd),
-    new Date().toISOString().replace(/[:.]/g, "-"),
-  );
   const backupPath = path.join(backupRoot, relativePath);
   await mkdir(path.dirname(backupPath), { recursive: true });
   await copyFile(absolutePath, backupPath);
 }
 
 async function writeGeneratedFiles({ cwd, files, dependencies }) {
+  // One backup folder per build, resolved up front rather than re-derived for every file.
+  const backupRoot = path.join(getBackupRoot(cwd), new Date().toISOString().replace(/[:.]/g, "-"));
   let writtenCount = 0;
   for (const file of files || []) {
     const relativePath = String(file?.path || "").replace(/\\/g, "/").replace(/^\/+/, "");
@@ -118,13 +116,13 @@ async function writeGeneratedFiles({ cwd, files, dependencies }) {
       continue;
     }
     const destination = path.join(cwd, relativePath);
-    await backupFile(cwd, relativePath);
+    await backupFile(cwd, relativePath, backupRoot);
     await mkdir(path.dirname(destination), { recursive: true });
     await writeFile(destination, String(file?.content || ""), "utf8");
     writtenCount += 1;
   }
   if (dependencies?.length) {
-    await backupFile(cwd, "requirements.txt");
+    await backupFile(cwd, "requirements.txt", backupRoot);
     await writeFile(
       path.join(cwd, "requirements.txt"),
       `${Array.from(new Set(["fastapi", "uvicorn[standard]", "sqlmodel", ...dependencies])).sort().join("\n")}\n`,
@@ -141,9 +139,12 @@ async function handleBuild(promptText) {
   }
 
   const cwd = process.cwd();
-  const config = await loadConfig();
-  const projectState = await getOrCreateProjectState(cwd);
-  const context = await collectProjectContext(cwd);
+  // The config, project state, and workspace scan touch disjoint files (.interius is never scanned), so load them together.
+  const [config, projectState, context] = await Promise.all([
+    loadConfig(),
+    getOrCreateProjectState(cwd),
+    collectProjectContext(cwd),
+  ]);
 
   logStep(`Using backend ${config.backendUrl}`);
   logStep(`Scanning local workspace: ${cwd}`);
@@ -120,6 +120,7 @@ async function walkDirectory(rootDir, relativeDir = "") {
   const absoluteDir = path.join(rootDir, relativeDir);
   const entries = await readdir(absoluteDir, { withFileTypes: true });
   const files = [];
+  const subdirectories = [];
 
   for (const entry of entries) {
     if (IGNORED_DIRS.has(entry.name)) {
@@ -127,13 +128,17 @@ async function walkDirectory(rootDir, relativeDir = "") {
     }
     const relativePath = path.posix.join(relativeDir.split(path.sep).join(path.posix.sep), entry.name);
     if (entry.isDirectory()) {
-      files.push(...(await walkDirectory(rootDir, relativePath)));
+      subdirectories.push(relativePath);
       continue;
     }
     if (entry.isFile()) {
       files.push(relativePath);
     }
   }
+  // Sibling directories are independent, so their readdir calls overlap instead of running one after another.
+  for (const nested of await Promise.all(subdirectories.map((dir) => walkDirectory(rootDir, dir)))) {
+    files.push(...nested);
+  }
   return files;
 }
 
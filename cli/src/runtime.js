@@ -78,11 +78,20 @@ export async function ensureLocalEnvironment({ cwd, dependencies, onProgress })
   }
 
   const requirementsPath = path.join(cwd, "requirements.txt");
-  await writeFile(requirementsPath, buildRequirementsContent(dependencies), "utf8");
+  const requirementsContent = buildRequirementsContent(dependencies);
+  await writeFile(requirementsPath, requirementsContent, "utf8");
 
-  onProgress?.("Installing Python dependencies locally...");
-  await runCommand(venvPython, ["-m", "pip", "install", "--upgrade", "pip"], { cwd });
-  await runCommand(venvPython, ["-m", "pip", "install", "-r", "requirements.txt"], { cwd });
+  // The venv records what it was last installed from, so unchanged requirements reuse the warm environment.
+  const installedStampPath = path.join(cwd, ".venv", ".interius-requirements.txt");
+  const installedRequirements = await readFile(installedStampPath, "utf8").catch(() => null);
+  if (installedRequirements === requirementsContent) {
+    onProgress?.("Python dependencies are already up to date.");
+  } else {
+    onProgress?.("Installing Python dependencies locally...");
+    await runCommand(venvPython, ["-m", "pip", "install", "--upgrade", "pip"], { cwd });
+    await runCommand(venvPython, ["-m", "pip", "install", "-r", "requirements.txt"], { cwd });
+    await writeFile(installedStampPath, requirementsContent, "utf8");
+  }
 
   return {
     venvPython,
@@ -90,19 +99,31 @@ export async function ensureLocalEnvironment({ cwd, dependencies, onProgress })
   };
 }
 
-function findFreePort(start = 8000) {
+function listenOnPort(port) {
   return new Promise((resolve, reject) => {
     const server = net.createServer();
     server.unref();
     server.on("error", reject);
-    server.listen(start, "127.0.0.1", () => {
+    server.listen(port, "127.0.0.1", () => {
       const address = server.address();
-      const port = typeof address === "object" && address ? address.port : start;
-      server.close(() => resolve(port));
+      const boundPort = typeof address === "object" && address ? address.port : port;
+      server.close(() => resolve(boundPort));
     });
   });
 }
 
+export async function findFreePort(start = 8000) {
+  try {
+    return await listenOnPort(start);
+  } catch (error) {
+    if (error?.code !== "EADDRINUSE") {
+      throw error;
+    }
+    // Let the OS hand out an ephemeral port instead of failing when the preferred one is taken.
+    return listenOnPort(0);
+  }
+}
+
 export async function detectAppModule(cwd) {
   const appMain = path.join(cwd, "app", "main.py");
   if (await fileExists(appMain)) {
@@ -134,9 +155,14 @@ export async function stopLocalApp(cwd) {
   }
 }
 
-async function waitForUrl(url, timeoutMs = 60_000) {
+async function waitForUrl(url, timeoutMs = 60_000, { hasExited, exited } = {}) {
   const deadline = Date.now() + timeoutMs;
+  let attempt = 0;
   while (Date.now() < deadline) {
+    // A server process that already died will never answer, so stop polling right away.
+    if (hasExited?.()) {
+      return false;
+    }
     try {
       const response = await fetch(url, { method: "GET" });
       if (response.ok) {
@@ -145,7 +171,18 @@ async function waitForUrl(url, timeoutMs = 60_000) {
     } catch {
       // Retry until deadline.
     }
-    await new Promise((resolve) => setTimeout(resolve, 1_000));
+    // Back off from 50ms up to 1s so a fast start is noticed quickly without hammering a slow one.
+    const delayMs = Math.min(1_000, 50 * 2 ** attempt, Math.max(0, deadline - Date.now()));
+    attempt += 1;
+    // Wake on the server's exit event as well, so a crash is reported without sitting out the backoff delay.
+    let timer;
+    await Promise.race([
+      new Promise((resolve) => {
+        timer = setTimeout(resolve, delayMs);
+      }),
+      ...(exited ? [exited] : []),
+    ]);
+    clearTimeout(timer);
   }
   return false;
 }
@@ -182,22 +219,33 @@ export async function startLocalApp({ cwd, dependencies, onProgress }) {
     },
   );
 
+  let exited = false;
+  const exitedPromise = new Promise((resolve) => {
+    child.once("exit", () => {
+      exited = true;
+      resolve();
+    });
+  });
   child.unref();
   await logHandle.close();
 
   const swaggerUrl = `http://127.0.0.1:${port}/docs`;
   const openapiUrl = `http://127.0.0.1:${port}/openapi.json`;
-  const ready = await waitForUrl(openapiUrl);
+  const ready = await waitForUrl(openapiUrl, 60_000, {
+    hasExited: () => exited,
+    exited: exitedPromise,
+  });
   if (!ready) {
-    if (process.platform === "win32") {
-      spawnSync("taskkill", ["/PID", String(child.pid), "/T", "/F"], { stdio: "ignore" });
-    } else {
-      process.kill(child.pid, "SIGTERM");
+    if (!exited) {
+      if (process.platform === "win32") {
+        spawnSync("taskkill", ["/PID", String(child.pid), "/T", "/F"], { stdio: "ignore" });
+      } else {
+        process.kill(child.pid, "SIGTERM");
+      }
     }
     const logs = await readRuntimeLogs(cwd);
-    throw new Error(
-      `Local app did not become ready in time.\n\nRecent logs:\n${logs || "(no logs yet)"}`,
-    );
+    const reason = exited ? "Local app exited during startup." : "Local app did not become ready in time.";
+    throw new Error(`${reason}\n\nRecent logs:\n${logs || "(no logs yet)"}`);
   }
 
   const runtime = {
@@ -1,9 +1,10 @@
 import test from "node:test";
 import assert from "node:assert/strict";
+import net from "node:net";
 import os from "node:os";
 import path from "node:path";
 
-import { getVenvPythonPath } from "../src/runtime.js";
+import { findFreePort, getVenvPythonPath } from "../src/runtime.js";
 
 test("getVenvPythonPath resolves platform-specific interpreter path", () => {
   const result = getVenvPythonPath(path.join(os.tmpdir(), "interius-cli"));
@@ -13,3 +14,16 @@ test("getVenvPythonPath resolves platform-specific interpreter path", () => {
   }
   assert.match(result, /\/\.venv\/bin\/python$/);
 });
+
+test("findFreePort falls back to an ephemeral port when the preferred one is busy", async () => {
+  const blocker = net.createServer();
+  await new Promise((resolve) => blocker.listen(0, "127.0.0.1", resolve));
+  const busyPort = blocker.address().port;
+  try {
+    const port = await findFreePort(busyPort);
+    assert.notEqual(port, busyPort);
+    assert.ok(port > 0);
+  } finally {
+    await new Promise((resolve) => blocker.close(resolve));
+  }
+});
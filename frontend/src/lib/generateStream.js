@@ -1,3 +1,5 @@
+import { trimRecentMessages } from './interface';
+
 function getBackendBaseUrl() {
     const explicit =
         import.meta.env.VITE_BACKEND_URL ||
@@ -47,7 +49,8 @@ export async function streamThreadChatGeneration({
         },
         body: JSON.stringify({
             prompt,
-            recent_messages: recentMessages,
+            // Send the same bounded window the intent router uses, not the whole thread on every turn.
+            recent_messages: trimRecentMessages(recentMessages),
             attachment_summaries: attachmentSummaries,
             thread_context_files: threadContextFiles,
             stop_after_architecture: stopAfterArchitecture,
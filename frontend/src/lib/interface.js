@@ -18,7 +18,7 @@ function toInterfaceContextMessage(message) {
     return { role, content };
 }
 
-function trimRecentMessages(messages) {
+export function trimRecentMessages(messages) {
     return (messages || [])
         .map(toInterfaceContextMessage)
         .filter(Boolean)